@@ -19,6 +19,7 @@ class RandomAgent:
         self.game = game
 
     def calculate_action(self, *arg, **kwargs):
+        legal = self.game.legal_actions(self.player_id)
         while 1:
             rand = random.random()
             val = None
@@ -30,17 +31,13 @@ class RandomAgent:
                 action = ActionType.CALL
             else:
                 action = ActionType.RAISE
-                val = (
-                    random.randint(2, 15)
-                    + self.game.player_bet_amount(self.player_id)
-                    + self.game.chips_to_call(self.player_id)
-                )
+                val = random.randint(2, 15) + legal.bet_amount + legal.chips_to_call
 
                 if val >= self.game.players[self.player_id].chips:
                     action = ActionType.ALL_IN
                     val = None
 
-            if self.game.validate_move(self.player_id, action, val):
+            if legal.is_legal(action, val):
                 break
         return action, val
 
@@ -86,12 +83,12 @@ class RLAgent:
         else:
             val = None
 
-        if not self.game.validate_move(self.player_id, action, val):
-            action = (
-                ActionType.CHECK
-                if self.game.validate_move(self.player_id, ActionType.CHECK, None)
-                else ActionType.FOLD
-            )
+        legal = self.game.legal_actions(self.player_id)
+        if not legal.is_legal(action, val):
+            if ActionType.CHECK in legal.actions:
+                action = ActionType.CHECK
+            else:
+                action = ActionType.FOLD
             val = None
 
         return action, val
@@ -135,6 +132,7 @@ class CrammerAgent:
         # Possible actions should always include FOLD and RAISE.
         # CHECK and CALL may sometimes be invalid.
         # I don't believe CHECK and CALL can ever be simultaneously possible.
+        legal = self.game.legal_actions(curr_player_id)
         possible_actions = []  # 3 in length.
         for action in self.num_to_action.values():
             if action.name == "RAISE":
@@ -142,7 +140,7 @@ class CrammerAgent:
             else:
                 val = None
 
-            if self.game.validate_move(curr_player_id, action, val):
+            if legal.is_legal(action, val):
                 possible_actions.append(action.name)
 
             # All other hand phases besides PREFLOP.
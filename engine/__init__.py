@@ -2,7 +2,7 @@
 Main package for texasholdem
 """
 
-from engine.game.game import TexasHoldEm
+from engine.game.game import Move, TexasHoldEm
 from engine.game.hand_phase import HandPhase
 from engine.game.action_type import ActionType
 from engine.game.player_state import PlayerState
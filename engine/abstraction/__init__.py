@@ -0,0 +1,3 @@
+"""The abstraction package groups strategically similar hands into buckets"""
+
+from engine.abstraction.buckets import bucket, build_buckets
@@ -0,0 +1,347 @@
+"""
+The buckets module computes per street hand strength buckets offline and
+serves them from memory mapped arrays at runtime.
+
+Every hand on a street is described by its strength against a random hand:
+    - river: its equity, bucketed by percentile, so each bucket holds about the
+      same share of hands
+    - flop and turn: the histogram of its river equity over every runout,
+      bucketed by k-means on the cumulative histograms (a cheap stand-in for the
+      earth mover's distance between the distributions)
+
+Buckets are numbered from weakest to strongest and stored as a dense uint16
+array per street, indexed by the suit isomorphism class of the hole cards and
+the board as one round (see :func:`engine.card.isomorphism.board_set_indexer`).
+The order the board was dealt in does not change its strength, so this is
+smaller than the per round index: 1,286,792 flop, 13,960,050 turn and
+123,156,254 river classes. Preflop the 169 starting hand classes are the
+buckets.
+
+The tables are built over a process pool with:
+    python -m engine.abstraction.buckets [flop|turn|river] [buckets] [processes]
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import os
+import sys
+
+import numpy as np
+
+from engine.card.card import Card
+from engine.card.combos import CARDS, NUM_COMBOS, blocked_combos, combo_cards
+from engine.card.isomorphism import HandIndexer, board_set_index, board_set_indexer
+from engine.equity.exact import enumerate_runouts
+from engine.equity.ranges import river_combo_equities
+from engine.evaluator.preflop_table import preflop_tables, starting_hand_class
+
+STREETS: Dict[str, int] = {"flop": 3, "turn": 4, "river": 5}
+"""Street name to number of board cards"""
+
+DEFAULT_NUM_BUCKETS = 128
+NUM_BINS = 50
+"""Equity histogram bins of flop and turn hands"""
+
+FIT_BOARDS = 200
+"""Random boards whose hands fit the centroids or percentiles of a street"""
+
+DEFAULT_SEED = 7462
+
+_UNSET = np.iinfo(np.uint16).max
+
+
+def bucket_path(num_board: int) -> Path:
+    """
+    Returns:
+        Path: Where the bucket table of the street with num_board cards is saved
+    """
+    street = {cards: name for name, cards in STREETS.items()}[num_board]
+    return Path(__file__).with_name(f"{street}_buckets.npy")
+
+
+@lru_cache(maxsize=None)
+def board_indexer(num_board: int) -> HandIndexer:
+    """
+    Returns:
+        HandIndexer: The indexer of boards of num_board cards, without hole cards
+    """
+    return HandIndexer((num_board,))
+
+
+def strength_histograms(board: Sequence[Card], num_bins: int = NUM_BINS) -> np.ndarray:
+    """
+    Arguments:
+        board (Sequence[Card]): 3 or 4 board cards
+        num_bins (int): The number of equal width equity bins
+    Returns:
+        np.ndarray: A [1326, num_bins] float64 array, for every combo the share of
+            runouts after which its river equity against a random hand falls in
+            each bin. Rows of combos holding a board card are 0.
+    """
+    uniform = np.ones(NUM_COMBOS)
+    counts = np.zeros(NUM_COMBOS * num_bins)
+    for runout in enumerate_runouts(board).tolist():
+        equities = river_combo_equities(uniform, runout)
+        live = np.flatnonzero(~np.isnan(equities))
+        bins = np.minimum((equities[live] * num_bins).astype(np.intp), num_bins - 1)
+        counts += np.bincount(live * num_bins + bins, minlength=len(counts))
+
+    counts = counts.reshape(NUM_COMBOS, num_bins)
+    totals = counts.sum(axis=1, keepdims=True)
+    return np.divide(counts, totals, out=counts, where=totals > 0)
+
+
+def _features(board: Sequence[Card], live: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The river equity [L] or cumulative equity histogram [L, bins]
+            of the given live combos on board
+    """
+    if len(board) == 5:
+        return river_combo_equities(np.ones(NUM_COMBOS), board)[live]
+    return strength_histograms(board)[live].cumsum(axis=1)
+
+
+def _nearest(
+    points: np.ndarray, centroids: np.ndarray, chunk_size: int = 1 << 16
+) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The index of the centroid closest to every point
+    """
+    squared_norms = (centroids**2).sum(axis=1)
+    nearest = np.empty(len(points), dtype=np.intp)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start : start + chunk_size]
+        # squared distances, up to the ||point||^2 every centroid shares
+        nearest[start : start + chunk_size] = (
+            squared_norms - 2 * chunk @ centroids.T
+        ).argmin(axis=1)
+    return nearest
+
+
+def _kmeans(
+    points: np.ndarray, num_clusters: int, rng: np.random.Generator, iterations: int
+) -> np.ndarray:
+    """
+    Lloyd's algorithm from num_clusters random points.
+
+    Returns:
+        np.ndarray: The [num_clusters, D] centroids
+    """
+    centroids = points[rng.choice(len(points), num_clusters, replace=False)]
+    for _ in range(iterations):
+        labels = _nearest(points, centroids)
+        counts = np.bincount(labels, minlength=num_clusters)
+        sums = np.stack(
+            [np.bincount(labels, dim, minlength=num_clusters) for dim in points.T],
+            axis=1,
+        )
+
+        # empty clusters keep their centroid
+        updated = np.where(
+            counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids
+        )
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return centroids
+
+
+def fit_street(
+    num_board: int,
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    num_boards: int = FIT_BOARDS,
+    seed: int = DEFAULT_SEED,
+    iterations: int = 100,
+) -> np.ndarray:
+    # pylint: disable=too-many-arguments
+    """
+    Fits the buckets of a street on the hands of random boards.
+
+    Arguments:
+        num_board (int): The number of board cards, 3, 4 or 5
+        num_buckets (int): The number of buckets
+        num_boards (int): How many random boards to fit on
+        seed (int): Seed of the boards and the k-means initialization
+        iterations (int): The most k-means iterations
+    Returns:
+        np.ndarray: The river equity upper edges of the first num_buckets - 1
+            buckets [num_buckets - 1], or the k-means centroids of the cumulative
+            histograms [num_buckets, bins], weakest bucket first
+    """
+    rng = np.random.default_rng(seed)
+    features = []
+    for _ in range(num_boards):
+        board = [CARDS[i] for i in rng.choice(len(CARDS), num_board, replace=False)]
+        features.append(_features(board, np.flatnonzero(~blocked_combos(board))))
+    features = np.concatenate(features)
+
+    if num_board == 5:
+        return np.quantile(features, np.linspace(0, 1, num_buckets + 1)[1:-1])
+
+    centroids = _kmeans(features, num_buckets, rng, iterations)
+    # a lower cumulative histogram is a higher expected equity
+    return centroids[np.argsort(-centroids.sum(axis=1))]
+
+
+def _assign(features: np.ndarray, model: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The uint16 bucket of every hand's features under the fit model
+    """
+    if features.ndim == 1:
+        return np.searchsorted(model, features, side="right").astype(np.uint16)
+    return _nearest(features, model).astype(np.uint16)
+
+
+def _board_buckets(
+    num_board: int, start: int, stop: int, model: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Buckets every hand on the canonical boards [start, stop) of a street.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The hand indices and their buckets
+    """
+    indexer = board_set_indexer(num_board)
+    indices: List[int] = []
+    buckets = []
+    for board_index in range(start, stop):
+        (board,) = board_indexer(num_board).unindex(board_index)
+        live = np.flatnonzero(~blocked_combos(board))
+        buckets.append(_assign(_features(board, live), model))
+        indices.extend(indexer.index((combo_cards(combo), board)) for combo in live)
+    return np.array(indices, dtype=np.int64), np.concatenate(buckets)
+
+
+def build_buckets(
+    num_board: int,
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    processes: int = 1,
+    seed: int = DEFAULT_SEED,
+    path: Optional[Union[str, os.PathLike]] = None,
+    chunk_size: int = 16,
+) -> Path:
+    # pylint: disable=too-many-arguments
+    """
+    Fits and writes the bucket table of a street.
+
+    Every hand class has a member on each canonical board, so bucketing all hole
+    cards on the canonical boards fills the whole table.
+
+    Arguments:
+        num_board (int): The number of board cards, 3, 4 or 5
+        num_buckets (int): The number of buckets, at most 65535
+        processes (int): Bucket the boards over a pool of this many processes,
+            defaults to 1 (bucket in this process)
+        seed (int): Seed of the fit, see :func:`fit_street`
+        path (Union[str, os.PathLike], optional): Where to write the table,
+            defaults to :func:`bucket_path`
+        chunk_size (int): Canonical boards per task sent to the pool
+    Returns:
+        Path: The written table
+    Raises:
+        ValueError: If num_board or num_buckets are invalid
+    """
+    if num_board not in STREETS.values():
+        raise ValueError(f"Expected 3, 4 or 5 board cards, got {num_board}")
+    if not 1 < num_buckets < _UNSET:
+        raise ValueError(f"Expected 2 to {_UNSET - 1} buckets, got {num_buckets}")
+
+    path = Path(path if path is not None else bucket_path(num_board))
+    model = fit_street(num_board, num_buckets, seed=seed)
+
+    num_boards = board_indexer(num_board).size
+    chunks = [
+        (num_board, start, min(start + chunk_size, num_boards), model)
+        for start in range(0, num_boards, chunk_size)
+    ]
+
+    tmp_path = path.with_suffix(".tmp.npy")
+    size = board_set_indexer(num_board).size
+    table = np.lib.format.open_memmap(tmp_path, "w+", np.uint16, (size,))
+    table[:] = _UNSET
+    if processes > 1:
+        with ProcessPoolExecutor(processes) as executor:
+            for indices, buckets in executor.map(_board_buckets, *zip(*chunks)):
+                table[indices] = buckets
+    else:
+        for chunk in chunks:
+            indices, buckets = _board_buckets(*chunk)
+            table[indices] = buckets
+
+    if (table == _UNSET).any():
+        raise RuntimeError(f"{int((table == _UNSET).sum())} hand classes not bucketed")
+    table.flush()
+    del table
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_bucket_table(
+    num_board: int, path: Optional[Union[str, os.PathLike]] = None
+) -> np.ndarray:
+    """
+    Arguments:
+        num_board (int): The number of board cards, 3, 4 or 5
+        path (Union[str, os.PathLike], optional): The table to map, defaults to
+            :func:`bucket_path`
+    Returns:
+        np.ndarray: The read-only, memory mapped uint16 bucket table
+    Raises:
+        OSError: If the table does not exist, see the module docstring to build it
+        ValueError: If the table has the wrong shape or type
+    """
+    path = path if path is not None else bucket_path(num_board)
+    table = np.load(path, mmap_mode="r")
+    if table.shape != (board_set_indexer(num_board).size,) or table.dtype != np.uint16:
+        raise ValueError(f"Invalid bucket table {path}: {table.shape} {table.dtype}")
+    return table
+
+
+@lru_cache(maxsize=None)
+def _preflop_buckets() -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The [169] position of every starting hand class when sorted by
+            heads-up equity
+    """
+    heads_up = preflop_tables()[0][:, 0]
+    return np.argsort(np.argsort(heads_up, kind="stable"))
+
+
+@lru_cache(maxsize=None)
+def bucket_table(num_board: int) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The default bucket table of a street, mapped on first use
+    """
+    return load_bucket_table(num_board)
+
+
+def bucket(hand: Sequence[Card], board: Sequence[Card] = ()) -> int:
+    """
+    Arguments:
+        hand (Sequence[Card]): Two hole cards
+        board (Sequence[Card]): The 0, 3, 4 or 5 board cards, in any order
+    Returns:
+        int: The bucket of the hand on its street, 0 is the weakest. Preflop the
+            169 starting hand classes are the buckets, by heads-up equity.
+    Raises:
+        ValueError: If the cards are invalid
+    """
+    if not board:
+        return int(_preflop_buckets()[starting_hand_class(hand)])
+    return int(bucket_table(len(board))[board_set_index(hand, board)])
+
+
+if __name__ == "__main__":
+    street_board = STREETS[sys.argv[1]] if len(sys.argv) > 1 else STREETS["flop"]
+    street_buckets = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_NUM_BUCKETS
+    num_processes = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    print(f"wrote {build_buckets(street_board, street_buckets, num_processes)}")
@@ -3,4 +3,5 @@ The card package. Includes the card and deck module.
 """
 
 from engine.card.card import Card
+from engine.card.card_set import CardSet
 from engine.card.deck import Deck
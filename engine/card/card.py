@@ -38,12 +38,19 @@ This representation will allow us to do very important things like:
 - Detect straights
 
 and is also quite performant.
+
+The 52 cards are built once on import and interned, so ``Card("As")``,
+``Card.from_int(...)`` and the decks return the same objects. Their attributes
+are read from the 52 entry tables below (indexed by card index, rank * 4 +
+suit index in spades, hearts, diamonds, clubs order) and stored on each card,
+so reading one is a plain attribute access without bit arithmetic or parsing.
 """
 
 from __future__ import annotations
 
+from functools import cached_property
+from typing import Dict, Iterable, Tuple, Union
 import math
-from typing import Union, Iterable
 
 
 class Card(int):
@@ -108,7 +115,8 @@ class Card(int):
 
         """
         if isinstance(arg, str):
-            return Card.from_string(arg)
+            card = _STRING_TO_CARD.get(arg)
+            return card if card is not None else Card.from_string(arg)
 
         return Card.from_int(arg)
 
@@ -153,10 +161,21 @@ class Card(int):
         Args:
             card_int (int): An int representing a card.
         Returns:
-            (Card): The 32bit int representing the card as described above
+            (Card): The 32bit int representing the card as described above, the
+                interned card for every one of the 52 cards
         """
+        card = _INTERNED.get(card_int)
+        if card is not None and cls is Card:
+            return card
         return super(Card, cls).__new__(cls, card_int)
 
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"Cards are immutable, cannot set {name!r}")
+
+    def __reduce__(self):
+        # copies and unpickled cards are the interned cards
+        return Card.from_int, (int(self),)
+
     def __str__(self) -> str:
         """
         Translates card into a readable string.
@@ -173,7 +192,7 @@ class Card(int):
     def __repr__(self) -> str:
         return f'Card("{str(self)}")'
 
-    @property
+    @cached_property
     def rank(self) -> int:
         """
         The rank of the card as an int.
@@ -189,7 +208,7 @@ class Card(int):
 
         return (self >> 8) & 0xF
 
-    @property
+    @cached_property
     def suit(self) -> int:
         """
         The suit int of the card using the following table:
@@ -216,7 +235,7 @@ class Card(int):
         """
         return (self >> 12) & 0xF
 
-    @property
+    @cached_property
     def bitrank(self) -> int:
         """
         The bitrank of the card. This returns 2^k where k is the
@@ -231,7 +250,7 @@ class Card(int):
         """
         return (self >> 16) & 0x1FFF
 
-    @property
+    @cached_property
     def prime(self) -> int:
         """
         Gets the prime associated with the card. This returns the kth prime
@@ -246,6 +265,21 @@ class Card(int):
         """
         return self & 0x3F
 
+    @cached_property
+    def index(self) -> int:
+        """
+        The index of the card in the tables of this module, i.e. in :data:`CARDS`.
+
+        Example:
+            134236965 ("Kd") --> 46
+
+        Returns:
+            int: rank * 4 + suit index, the suit index being 0-3 for spades,
+                hearts, diamonds and clubs.
+
+        """
+        return self.rank * 4 + SUIT_INDEX[self.suit]
+
     @property
     def pretty_string(self) -> str:
         """
@@ -272,6 +306,48 @@ class Card(int):
         return "".join(output)
 
 
+SUIT_INDEX = {1: 0, 2: 1, 4: 2, 8: 3}
+"""Suit nibble to suit index"""
+
+
+def _build_cards() -> Tuple[Card, ...]:
+    """
+    Returns:
+        tuple[Card, ...]: The 52 cards by card index, with their attributes stored
+    """
+    cards = []
+    for rank, rank_char in enumerate(Card.STR_RANKS):
+        for suit_char, suit in Card.CHAR_SUIT_TO_INT_SUIT.items():
+            prime, bitrank = Card.PRIMES[rank], 1 << rank
+            card = int.__new__(Card, bitrank << 16 | suit << 12 | rank << 8 | prime)
+            # bypasses __setattr__, the cached properties read these
+            card.__dict__.update(
+                rank=rank,
+                suit=suit,
+                bitrank=bitrank,
+                prime=prime,
+                index=len(cards),
+            )
+            cards.append(card)
+    return tuple(cards)
+
+
+CARDS = _build_cards()
+"""Every card, by card index"""
+
+CARD_RANKS = tuple(card.rank for card in CARDS)
+CARD_SUITS = tuple(card.suit for card in CARDS)
+CARD_SUIT_INDICES = tuple(SUIT_INDEX[card.suit] for card in CARDS)
+CARD_BITRANKS = tuple(card.bitrank for card in CARDS)
+CARD_PRIMES = tuple(card.prime for card in CARDS)
+CARD_STRINGS = tuple(
+    Card.STR_RANKS[card.rank] + Card.INT_SUIT_TO_CHAR_SUIT[card.suit] for card in CARDS
+)
+
+_INTERNED: Dict[int, Card] = {int(card): card for card in CARDS}
+_STRING_TO_CARD: Dict[str, Card] = dict(zip(CARD_STRINGS, CARDS))
+
+
 def card_strings_to_int(card_strs: Iterable[str]) -> list[Card]:
     """
     Args:
@@ -0,0 +1,171 @@
+"""
+The card_set module holds sets of cards as a single 52 bit mask, the card of
+card index i (see :data:`engine.card.card.CARDS`) being bit i. Membership,
+union, intersection and conflict checks are then one integer operation, and
+the size is a popcount.
+
+Example:
+    hand = CardSet([Card("As"), Card("Kd")])
+    board = CardSet(card.card_strings_to_int(["Ah", "7c", "2d"]))
+    hand.isdisjoint(board)  # True
+    len(hand | board)  # 5
+    Card("7c") in board  # True
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List
+
+from engine.card.card import CARDS, Card
+
+FULL_MASK = (1 << len(CARDS)) - 1
+"""The mask of the full deck"""
+
+
+def card_mask(cards: Iterable[Card]) -> int:
+    """
+    Arguments:
+        cards (Iterable[Card]): Cards, duplicates are ignored
+    Returns:
+        int: The mask with the bit of every card set
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.index
+    return mask
+
+
+class CardSet:
+    """
+    An immutable set of cards backed by a 52 bit mask.
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        """
+        Arguments:
+            cards (Iterable[Card]): The cards of the set, a list or another
+                CardSet. Duplicates are ignored.
+        """
+        object.__setattr__(self, "mask", _mask(cards))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> CardSet:
+        """
+        Arguments:
+            mask (int): A mask with bit i set for the card of card index i
+        Returns:
+            CardSet: The set of those cards
+        Raises:
+            ValueError: If the mask has bits beyond the 52 cards
+        """
+        if mask & ~FULL_MASK:
+            raise ValueError(f"Expected a mask of at most 52 bits, got {mask:#x}")
+        card_set = cls.__new__(cls)
+        object.__setattr__(card_set, "mask", mask)
+        return card_set
+
+    @classmethod
+    def full(cls) -> CardSet:
+        """
+        Returns:
+            CardSet: The full deck
+        """
+        return cls.from_mask(FULL_MASK)
+
+    def to_list(self) -> List[Card]:
+        """
+        Returns:
+            list[Card]: The cards, by card index
+        """
+        return list(self)
+
+    def union(self, other: Iterable[Card]) -> CardSet:
+        """
+        Returns:
+            CardSet: The cards in either set
+        """
+        return CardSet.from_mask(self.mask | _mask(other))
+
+    def intersection(self, other: Iterable[Card]) -> CardSet:
+        """
+        Returns:
+            CardSet: The cards in both sets
+        """
+        return CardSet.from_mask(self.mask & _mask(other))
+
+    def difference(self, other: Iterable[Card]) -> CardSet:
+        """
+        Returns:
+            CardSet: The cards of this set that are not in other
+        """
+        return CardSet.from_mask(self.mask & ~_mask(other))
+
+    def complement(self) -> CardSet:
+        """
+        Returns:
+            CardSet: The cards of the deck that are not in this set
+        """
+        return CardSet.from_mask(FULL_MASK & ~self.mask)
+
+    def isdisjoint(self, other: Iterable[Card]) -> bool:
+        """
+        Returns:
+            bool: True if no card is in both sets, i.e. the sets do not conflict
+        """
+        return not self.mask & _mask(other)
+
+    def issubset(self, other: Iterable[Card]) -> bool:
+        """
+        Returns:
+            bool: True if every card of this set is in other
+        """
+        return not self.mask & ~_mask(other)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __invert__ = complement
+    __le__ = issubset
+
+    def __contains__(self, card: Card) -> bool:
+        return bool(self.mask >> card.index & 1)
+
+    def __iter__(self) -> Iterator[Card]:
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield CARDS[low.bit_length() - 1]
+            mask ^= low
+
+    def __len__(self) -> int:
+        # popcount
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"CardSets are immutable, cannot set {name!r}")
+
+    def __reduce__(self):
+        return CardSet.from_mask, (self.mask,)
+
+    def __repr__(self) -> str:
+        return f"CardSet({self.to_list()})"
+
+    def __str__(self) -> str:
+        return " ".join(str(card) for card in self)
+
+
+def _mask(cards: Iterable[Card]) -> int:
+    return cards.mask if isinstance(cards, CardSet) else card_mask(cards)
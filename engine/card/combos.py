@@ -0,0 +1,84 @@
+"""
+The combos module numbers the 52 cards and the 1326 two card combos, so hole
+cards can index dense arrays such as equity matrices and range weights.
+
+Cards are numbered rank major, in the order of :meth:`Deck._get_full_deck`:
+    card index = rank * 4 + suit index (spades 0, hearts 1, diamonds 2, clubs 3)
+
+A combo of the cards i < j has the index j * (j - 1) / 2 + i.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from engine.card.card import CARDS as _CARDS, SUIT_INDEX, Card
+
+NUM_CARDS = 52
+NUM_COMBOS = 1326
+
+CARDS: List[Card] = list(_CARDS)
+"""Every card, by card index"""
+
+CARD_INDEX = {card: index for index, card in enumerate(CARDS)}
+"""Card int to card index"""
+
+COMBO_CARD_INDICES = np.array(
+    [(i, j) for j in range(NUM_CARDS) for i in range(j)], dtype=np.intp
+)
+"""[1326, 2] card indices of every combo, lower card index first"""
+
+COMBO_CARDS = np.array(CARDS, dtype=np.int64)[COMBO_CARD_INDICES]
+"""[1326, 2] card ints of every combo"""
+
+COMBO_INDEX = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.intp)
+COMBO_INDEX[COMBO_CARD_INDICES[:, 0], COMBO_CARD_INDICES[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBO_CARD_INDICES[:, 1], COMBO_CARD_INDICES[:, 0]] = np.arange(NUM_COMBOS)
+"""[52, 52] combo index of every pair of card indices, -1 on the diagonal"""
+
+CARD_COMBOS = np.zeros((NUM_CARDS, NUM_COMBOS), dtype=bool)
+CARD_COMBOS[COMBO_CARD_INDICES[:, 0], np.arange(NUM_COMBOS)] = True
+CARD_COMBOS[COMBO_CARD_INDICES[:, 1], np.arange(NUM_COMBOS)] = True
+"""[52, 1326] whether each combo holds each card"""
+
+
+def combo_index(cards: Sequence[Card]) -> int:
+    """
+    Arguments:
+        cards (Sequence[Card]): Two different cards, in any order
+    Returns:
+        int: The index of the combo in [0, 1326)
+    Raises:
+        ValueError: If not given two different cards
+    """
+    if len(cards) != 2 or cards[0] == cards[1]:
+        raise ValueError(f"Expected 2 different cards, got {list(map(str, cards))}")
+
+    low, high = CARD_INDEX[cards[0]], CARD_INDEX[cards[1]]
+    if low > high:
+        low, high = high, low
+    return high * (high - 1) // 2 + low
+
+
+def combo_cards(index: int) -> List[Card]:
+    """
+    Arguments:
+        index (int): A combo index in [0, 1326)
+    Returns:
+        list[Card]: The two cards of the combo
+    """
+    return [CARDS[i] for i in COMBO_CARD_INDICES[index]]
+
+
+def blocked_combos(cards: Sequence[Card]) -> np.ndarray:
+    """
+    Arguments:
+        cards (Sequence[Card]): Known cards, i.e. the board
+    Returns:
+        np.ndarray: A [1326] bool array, True for the combos holding any of cards
+    """
+    if not cards:
+        return np.zeros(NUM_COMBOS, dtype=bool)
+    return CARD_COMBOS[[CARD_INDEX[card] for card in cards]].any(axis=0)
@@ -1,33 +1,233 @@
-"""The deck module"""
+"""
+The deck module
 
-from typing import List
+Shuffled decks come from a :class:`DeckSource`, which generates thousands of
+permutations of the 52 card indices (see :data:`engine.card.card.CARDS`) at a
+time as a uint8 [N, 52] array and hands out one row per deck. A :class:`Deck`
+deals by advancing a position in its row. The first 5 cards of a row are the
+community cards, the rest are dealt to the players.
 
+:func:`deal_hands` deals a whole batch of hands at once, for simulations that
+run many tables in parallel.
+
+Reproducibility: an unseeded source seeds each block from the :mod:`random`
+module when it generates it, so ``random.seed()`` alone only fixes the decks of
+the next block. Call ``DECK_SOURCE.seed()`` right after it to drop the current
+block, or ``DECK_SOURCE.seed(n)`` for decks independent of :mod:`random`.
+Forked processes drop the parent's block and deal their own decks.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+import os
 import random
+
+import numpy as np
+
 from engine.card import card
-from engine.card.card import Card
+from engine.card.card import CARDS, Card
+from engine.card.card_set import CardSet
+
+NUM_COMMUNITY_CARDS = 5
+DEFAULT_BLOCK_SIZE = 4096
+"""Permutations generated at a time"""
+
+CARD_INTS = np.array(CARDS, dtype=np.int64)
+"""The card int of every card index"""
+
+DeckSnapshot = Tuple[Tuple[int, ...], Tuple[int, ...]]
+"""The card indices left to deal to the players and to the board"""
+
+
+class DeckSource:
+    """
+    Pre-generated shuffled orders of the 52 card indices.
+    """
+
+    def __init__(
+        self, block_size: int = DEFAULT_BLOCK_SIZE, seed: Optional[int] = None
+    ):
+        """
+        Arguments:
+            block_size (int): How many permutations to generate at a time,
+                defaults to 4096
+            seed (int, optional): Seed of the permutations. Without one, every
+                block is seeded from the :mod:`random` module, so seeding that
+                also seeds the decks from the next block on.
+        Raises:
+            ValueError: If block_size is less than 1
+        """
+        if block_size < 1:
+            raise ValueError(f"Expected a block_size of at least 1, got {block_size}")
+
+        self.block_size = block_size
+        self._rng: Optional[np.random.Generator] = None
+        self._block = np.empty((0, len(CARDS)), dtype=np.uint8)
+        self._next = 0
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None):
+        """
+        Reseeds the permutations and drops the ones generated so far.
+
+        Arguments:
+            seed (int, optional): The new seed, None to seed every block from
+                the :mod:`random` module
+        """
+        self._rng = None if seed is None else np.random.default_rng(seed)
+        self._block = self._block[:0]
+        self._next = 0
+
+    def _generate(self, num: int) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: A read-only uint8 [num, 52] array of random permutations
+        """
+        rng = self._rng
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        # the argsort of uniform random keys is a uniform random permutation
+        block = rng.random((num, len(CARDS))).argsort(axis=1).astype(np.uint8)
+        block.flags.writeable = False
+        return block
+
+    def next_order(self) -> List[int]:
+        """
+        Returns:
+            list[int]: The card indices of the next shuffled deck, in dealing order
+        """
+        if self._next == len(self._block):
+            self._block = self._generate(self.block_size)
+            self._next = 0
+        order = self._block[self._next].tolist()
+        self._next += 1
+        return order
+
+    def deal(self, num: int) -> np.ndarray:
+        """
+        Arguments:
+            num (int): How many shuffled decks to take
+        Returns:
+            np.ndarray: A uint8 [num, 52] array of the card indices of each deck,
+                in dealing order
+        """
+        orders = []
+        while num > 0:
+            if self._next == len(self._block):
+                self._block = self._generate(max(self.block_size, num))
+                self._next = 0
+            taken = self._block[self._next : self._next + num]
+            self._next += len(taken)
+            num -= len(taken)
+            orders.append(taken)
+        if not orders:
+            return np.empty((0, len(CARDS)), dtype=np.uint8)
+        return np.concatenate(orders)
+
+
+DECK_SOURCE = DeckSource()
+"""The source of every :class:`Deck` not given one, seed it for reproducible decks"""
+
+# forked workers (i.e. SubprocVecEnv) would otherwise deal the parent's block
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DECK_SOURCE.seed)
+
+
+def deal_hands(
+    num_hands: int, num_players: int, source: Optional[DeckSource] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deals many hands at once, as :class:`Deck` would deal each of them.
+
+    Arguments:
+        num_hands (int): How many hands to deal
+        num_players (int): Players per hand, from 2 to 23
+        source (DeckSource, optional): Where the decks come from, defaults to
+            :data:`DECK_SOURCE`
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The int64 card ints of the hole cards as
+            [num_hands, num_players, 2] and of the boards as [num_hands, 5], ready
+            for :func:`engine.evaluator.batch.evaluate_batch`
+    Raises:
+        ValueError: If the players do not fit in one deck
+    """
+    if not 2 <= num_players <= (len(CARDS) - NUM_COMMUNITY_CARDS) // 2:
+        raise ValueError(f"Expected 2 to 23 players, got {num_players}")
+
+    source = DECK_SOURCE if source is None else source
+    cards = CARD_INTS[source.deal(num_hands)]
+    boards = cards[:, :NUM_COMMUNITY_CARDS]
+    hands = cards[:, NUM_COMMUNITY_CARDS : NUM_COMMUNITY_CARDS + 2 * num_players]
+    return hands.reshape(num_hands, num_players, 2), boards
 
 
 class Deck:
     """
-    Class representing a deck. The first time we create, we seed the static
-    deck with the list of unique card integers. Each object instantiated simply
-    makes a copy of this object and shuffles it.
+    Class representing a deck. Each object instantiated takes the next shuffled
+    order from a :class:`DeckSource` and deals from it.
     """
 
     _FULL_DECK: List[Card] = []
 
-    def __init__(self):
-        self.cards = Deck._get_full_deck()
-        self.shuffle()
-        self.community_cards = self.cards[:5]
-        self.cards = self.cards[5:]
+    def __init__(
+        self,
+        dead_cards: Optional[Iterable[Card]] = None,
+        source: Optional[DeckSource] = None,
+    ):
+        """
+        Args:
+            dead_cards (Iterable[Card], optional): Cards to leave out of the deck,
+                a list or a :class:`~engine.card.card_set.CardSet`
+            source (DeckSource, optional): Where the shuffled order comes from,
+                defaults to :data:`DECK_SOURCE`
+        """
+        order = (DECK_SOURCE if source is None else source).next_order()
+        if dead_cards:
+            dead = CardSet(dead_cards).mask
+            order = [index for index in order if not dead >> index & 1]
+
+        # card indices and the position of the next card to deal
+        self._community = order[:NUM_COMMUNITY_CARDS]
+        self._community_position = 0
+        self._order = order
+        self._position = NUM_COMMUNITY_CARDS
+
+    @property
+    def cards(self) -> List[Card]:
+        """
+        Returns:
+            list[Card]: The cards left to deal to the players
+        """
+        return [CARDS[index] for index in self._order[self._position :]]
+
+    @cards.setter
+    def cards(self, cards: Iterable[Card]):
+        self._order = [card.index for card in cards]
+        self._position = 0
+
+    @property
+    def community_cards(self) -> List[Card]:
+        """
+        Returns:
+            list[Card]: The community cards left to deal
+        """
+        return [CARDS[index] for index in self._community[self._community_position :]]
+
+    @community_cards.setter
+    def community_cards(self, cards: Iterable[Card]):
+        self._community = [card.index for card in cards]
+        self._community_position = 0
 
     def shuffle(self) -> None:
         """
         Shuffles the remaining cards in the deck.
 
         """
-        random.shuffle(self.cards)
+        cards = self.cards
+        random.shuffle(cards)
+        self.cards = cards
 
     def draw(self, num=1, draw_from_community=False) -> List[Card]:
         """
@@ -41,17 +241,52 @@ class Deck:
             ValueError: If the deck size is less than the given n.
 
         """
-        if len(self.cards) < num:
-            raise ValueError(
-                f"Cannot draw {num} cards from deck of size {len(self.cards)}"
-            )
+        num_cards = len(self._order) - self._position
+        if num_cards < num:
+            raise ValueError(f"Cannot draw {num} cards from deck of size {num_cards}")
         if draw_from_community:
-            cards = self.community_cards[:num]
-            self.community_cards = self.community_cards[num:]
-        else:
-            cards = self.cards[:num]
-            self.cards = self.cards[num:]
-        return cards
+            start = self._community_position
+            self._community_position = min(start + num, len(self._community))
+            return [CARDS[index] for index in self._community[start : start + num]]
+
+        start = self._position
+        self._position += num
+        return [CARDS[index] for index in self._order[start : start + num]]
+
+    def snapshot(self) -> DeckSnapshot:
+        """
+        Returns:
+            DeckSnapshot: The card indices left to deal, for :meth:`from_snapshot`
+        """
+        return (
+            tuple(self._order[self._position :]),
+            tuple(self._community[self._community_position :]),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: DeckSnapshot) -> Deck:
+        """
+        Arguments:
+            snapshot (DeckSnapshot): As given by :meth:`snapshot`
+        Returns:
+            Deck: A deck that deals the same cards as the captured one, without
+                taking an order from a :class:`DeckSource`
+        """
+        order, community = snapshot
+        deck = cls.__new__(cls)
+        deck._order = list(order)
+        deck._position = 0
+        deck._community = list(community)
+        deck._community_position = 0
+        return deck
+
+    @property
+    def remaining(self) -> CardSet:
+        """
+        Returns:
+            CardSet: The cards not drawn yet, community cards included
+        """
+        return CardSet(self.cards + self.community_cards)
 
     def __str__(self) -> str:
         return card.card_list_to_pretty_str(self.cards)
@@ -0,0 +1,373 @@
+"""
+The isomorphism module maps hole cards and a board to a dense index of their
+suit isomorphism class, and back, after "A Fast and Optimal Hand Isomorphism
+Algorithm" (Waugh, 2013).
+
+Relabelling the suits of a hand does not change how it plays, so e.g. all 12
+ways to hold ace king offsuit are one class preflop. Per street the classes are
+numbered 0 to :func:`num_hand_indices` - 1 without gaps:
+
+    ========  =============  =============
+    Street    Cards          Classes
+    ========  =============  =============
+    Preflop   2              169
+    Flop      2 + 3          1,286,792
+    Turn      2 + 3 + 1      55,190,538
+    River     2 + 3 + 1 + 1  2,428,287,420
+    ========  =============  =============
+
+Cards are grouped into rounds (hole cards, flop, turn, river), and a hand is
+described suit by suit by the ranks it holds of that suit in every round. Each
+suit's history gets an index within its configuration (how many cards of the
+suit each round holds), and the hand is the multiset of its four suit
+histories. The index is the offset of the hand's configuration plus the
+multiset's index in the combinatorial number system.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+import itertools
+
+from engine.card.card import Card
+
+NUM_SUITS = 4
+NUM_RANKS = 13
+
+STREET_ROUNDS = {0: (2,), 3: (2, 3), 4: (2, 3, 1), 5: (2, 3, 1, 1)}
+"""Cards per round, by the number of board cards"""
+
+SUITS = (1, 2, 4, 8)
+"""Suit nibbles in the order canonical hands use them"""
+
+_POPCOUNT = [bin(mask).count("1") for mask in range(1 << NUM_RANKS)]
+_NCK = [[comb(n, k) for k in range(NUM_RANKS + 2)] for n in range(NUM_RANKS + 1)]
+
+_CARDS = [
+    {suit: Card(rank + Card.INT_SUIT_TO_CHAR_SUIT[suit]) for suit in SUITS}
+    for rank in Card.STR_RANKS
+]
+"""_CARDS[rank][suit nibble]: the card"""
+
+Config = Tuple[int, ...]
+"""The number of cards of one suit in every round"""
+
+
+def _multichoose(num_values: int, size: int) -> int:
+    return comb(num_values + size - 1, size)
+
+
+def _unrank_colex(index: int, size: int, num_values: int) -> List[int]:
+    """
+    Returns:
+        list[int]: The increasing sequence of size values z_j in [0, num_values)
+            with sum C(z_j, j + 1) == index
+    """
+    values = []
+    for position in range(size, 0, -1):
+        low, high = position - 1, num_values - 1
+        # largest value with C(value, position) <= index
+        while low < high:
+            middle = (low + high + 1) // 2
+            if comb(middle, position) <= index:
+                low = middle
+            else:
+                high = middle - 1
+        values.append(low)
+        index -= comb(low, position)
+        num_values = low
+    return values[::-1]
+
+
+class HandIndexer:
+    """
+    Indexes hands dealt in rounds of the given sizes, i.e. (2, 3) for the flop.
+    """
+
+    def __init__(self, cards_per_round: Sequence[int]):
+        """
+        Arguments:
+            cards_per_round (Sequence[int]): The cards dealt in each round
+        """
+        self.cards_per_round = tuple(cards_per_round)
+        self.num_rounds = len(self.cards_per_round)
+
+        # every way to split each round's cards over the 4 suits
+        splits = [
+            [
+                split
+                for split in itertools.product(range(cards + 1), repeat=NUM_SUITS)
+                if sum(split) == cards
+            ]
+            for cards in self.cards_per_round
+        ]
+        hand_configs = set()
+        for round_splits in itertools.product(*splits):
+            hand_configs.add(
+                tuple(sorted(zip(*round_splits), reverse=True))  # per suit configs
+            )
+
+        self.configs: List[Tuple[Config, ...]] = sorted(hand_configs, reverse=True)
+        self.offsets: List[int] = []
+        self._config_offsets: Dict[
+            Tuple[Config, ...], Tuple[int, List[Tuple[int, int]]]
+        ] = {}
+        self._config_groups: List[List[Tuple[int, int]]] = []
+        size = 0
+        for hand_config in self.configs:
+            # (histories per suit, number of suits) of each run of equal configs
+            groups = [
+                (self.num_suit_histories(config), len(list(same)))
+                for config, same in itertools.groupby(hand_config)
+            ]
+            self.offsets.append(size)
+            self._config_offsets[hand_config] = (size, groups)
+            self._config_groups.append(groups)
+            size += self._config_size(groups)
+        self.size = size
+
+    @staticmethod
+    def num_suit_histories(config: Config) -> int:
+        """
+        Returns:
+            int: How many ways one suit can hold config[i] cards in every round i
+        """
+        histories = 1
+        used = 0
+        for count in config:
+            histories *= comb(NUM_RANKS - used, count)
+            used += count
+        return histories
+
+    @staticmethod
+    def _config_size(groups: List[Tuple[int, int]]) -> int:
+        size = 1
+        for num_histories, count in groups:
+            size *= _multichoose(num_histories, count)
+        return size
+
+    def index(self, rounds: Sequence[Sequence[Card]]) -> int:
+        """
+        Arguments:
+            rounds (Sequence[Sequence[Card]]): The cards of every round
+        Returns:
+            int: The index of the hand's isomorphism class in [0, size)
+        Raises:
+            ValueError: If the rounds have the wrong sizes or repeat a card
+        """
+        if len(rounds) != self.num_rounds or any(
+            len(cards) != num_cards
+            for cards, num_cards in zip(rounds, self.cards_per_round)
+        ):
+            raise ValueError(
+                f"Expected rounds of {self.cards_per_round} cards, "
+                f"got {[[str(card) for card in cards] for cards in rounds]}"
+            )
+
+        # suit nibble -> (config, history index)
+        used = [0] * 9
+        counts = [[] for _ in range(9)]
+        indices = [0] * 9
+        radices = [1] * 9
+        for cards in rounds:
+            masks = [0] * 9
+            for card in cards:
+                suit = (card >> 12) & 0xF
+                bit = 1 << ((card >> 8) & 0xF)
+                if (used[suit] | masks[suit]) & bit:
+                    raise ValueError(f"Duplicate card {Card(card)}")
+                masks[suit] |= bit
+
+            for suit in SUITS:
+                mask, suit_used = masks[suit], used[suit]
+                # colex index of the ranks among the ranks not used before
+                colex = 0
+                position = 1
+                remaining = mask
+                while remaining:
+                    low_bit = remaining & -remaining
+                    rank = low_bit.bit_length() - 1
+                    colex += _NCK[rank - _POPCOUNT[suit_used & (low_bit - 1)]][position]
+                    position += 1
+                    remaining ^= low_bit
+
+                count = _POPCOUNT[mask]
+                indices[suit] += colex * radices[suit]
+                radices[suit] *= _NCK[NUM_RANKS - _POPCOUNT[suit_used]][count]
+                counts[suit].append(count)
+                used[suit] = suit_used | mask
+
+        histories = sorted(
+            ((tuple(counts[suit]), -indices[suit]) for suit in SUITS), reverse=True
+        )
+        hand_config = tuple(config for config, _ in histories)
+
+        offset, groups = self._config_offsets[hand_config]
+        index = 0
+        radix = 1
+        start = 0
+        for num_histories, count in groups:
+            # the suits sharing a config, by ascending history index
+            for j, (_, negative) in enumerate(histories[start : start + count]):
+                index += radix * comb(j - negative, j + 1)
+            radix *= _multichoose(num_histories, count)
+            start += count
+
+        return offset + index
+
+    def unindex(self, index: int) -> List[List[Card]]:
+        """
+        Arguments:
+            index (int): An index in [0, size)
+        Returns:
+            list[list[Card]]: The canonical hand of the class, cards of every round
+                sorted by rank and suit
+        Raises:
+            ValueError: If the index is out of range
+        """
+        if not 0 <= index < self.size:
+            raise ValueError(f"Index {index} out of range [0, {self.size})")
+
+        config_index = bisect_right(self.offsets, index) - 1
+        hand_config = self.configs[config_index]
+        index -= self.offsets[config_index]
+
+        suit_histories = []
+        for num_histories, count in self._config_groups[config_index]:
+            radix = _multichoose(num_histories, count)
+            index, group_index = divmod(index, radix)
+            values = _unrank_colex(group_index, count, num_histories + count - 1)
+            suit_histories.extend(value - j for j, value in enumerate(values))
+
+        rounds: List[List[Card]] = [[] for _ in range(self.num_rounds)]
+        for suit, config, history in zip(SUITS, hand_config, suit_histories):
+            available = list(range(NUM_RANKS))
+            for round_cards, count in zip(rounds, config):
+                num_available = len(available)
+                history, colex = divmod(history, comb(num_available, count))
+                positions = _unrank_colex(colex, count, num_available)
+                ranks = [available[position] for position in positions]
+                round_cards.extend(_CARDS[rank][suit] for rank in ranks)
+                available = [rank for rank in available if rank not in ranks]
+
+        for round_cards in rounds:
+            round_cards.sort(key=lambda card: (-card.rank, card.suit))
+        return rounds
+
+    def __repr__(self) -> str:
+        return f"HandIndexer({self.cards_per_round}, size={self.size:,})"
+
+
+@lru_cache(maxsize=None)
+def hand_indexer(num_board: int) -> HandIndexer:
+    """
+    Arguments:
+        num_board (int): The number of board cards, 0, 3, 4 or 5
+    Returns:
+        HandIndexer: The indexer of that street, built on first use
+    Raises:
+        ValueError: If num_board is not a street
+    """
+    if num_board not in STREET_ROUNDS:
+        raise ValueError(f"Expected 0, 3, 4 or 5 board cards, got {num_board}")
+    return HandIndexer(STREET_ROUNDS[num_board])
+
+
+def _rounds(hand: Sequence[Card], board: Sequence[Card]) -> List[Sequence[Card]]:
+    return [hand, board[:3], board[3:4], board[4:5]][: len(STREET_ROUNDS[len(board)])]
+
+
+def hand_index(hand: Sequence[Card], board: Sequence[Card] = ()) -> int:
+    """
+    Arguments:
+        hand (Sequence[Card]): Two hole cards
+        board (Sequence[Card]): The 0, 3, 4 or 5 board cards, in the order dealt
+    Returns:
+        int: The index of the isomorphism class of hand and board among the
+            :func:`num_hand_indices` classes of the street
+    Raises:
+        ValueError: If the cards are invalid
+    """
+    return hand_indexer(len(board)).index(_rounds(hand, board))
+
+
+def hand_unindex(index: int, num_board: int = 0) -> Tuple[List[Card], List[Card]]:
+    """
+    Arguments:
+        index (int): An index returned by :func:`hand_index`
+        num_board (int): The number of board cards of its street
+    Returns:
+        Tuple[list[Card], list[Card]]: The canonical hole cards and board
+    """
+    hand, *board_rounds = hand_indexer(num_board).unindex(index)
+    return hand, [card for cards in board_rounds for card in cards]
+
+
+def canonical_hand(
+    hand: Sequence[Card], board: Sequence[Card] = ()
+) -> Tuple[List[Card], List[Card]]:
+    """
+    Returns:
+        Tuple[list[Card], list[Card]]: The representative of the isomorphism
+            class of hand and board, equal for all suit relabellings of them
+    """
+    return hand_unindex(hand_index(hand, board), len(board))
+
+
+def num_hand_indices(num_board: int) -> int:
+    """
+    Returns:
+        int: How many isomorphism classes the street with num_board cards has
+    """
+    return hand_indexer(num_board).size
+
+
+@lru_cache(maxsize=None)
+def board_set_indexer(num_board: int) -> HandIndexer:
+    """
+    For values that do not depend on the order the board was dealt in, such as
+    hand strength, the board can be one round. That merges e.g. the turn classes
+    that only differ in which board card came on the turn, down to 13,960,050.
+
+    Arguments:
+        num_board (int): The number of board cards, 0, 3, 4 or 5
+    Returns:
+        HandIndexer: The indexer of hole cards and the board as one round, built
+            on first use
+    Raises:
+        ValueError: If num_board is not a street
+    """
+    if num_board not in STREET_ROUNDS:
+        raise ValueError(f"Expected 0, 3, 4 or 5 board cards, got {num_board}")
+    return HandIndexer((2, num_board) if num_board else (2,))
+
+
+def board_set_index(hand: Sequence[Card], board: Sequence[Card] = ()) -> int:
+    """
+    Arguments:
+        hand (Sequence[Card]): Two hole cards
+        board (Sequence[Card]): The 0, 3, 4 or 5 board cards, in any order
+    Returns:
+        int: The index of the isomorphism class of hand and board, see
+            :func:`board_set_indexer`
+    Raises:
+        ValueError: If the cards are invalid
+    """
+    if not board:
+        return board_set_indexer(0).index((hand,))
+    return board_set_indexer(len(board)).index((hand, board))
+
+
+def board_set_unindex(index: int, num_board: int = 0) -> Tuple[List[Card], List[Card]]:
+    """
+    Arguments:
+        index (int): An index returned by :func:`board_set_index`
+        num_board (int): The number of board cards of its street
+    Returns:
+        Tuple[list[Card], list[Card]]: The canonical hole cards and board
+    """
+    hand, *board = board_set_indexer(num_board).unindex(index)
+    return hand, board[0] if board else []
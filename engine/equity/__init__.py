@@ -0,0 +1,7 @@
+"""The equity package estimates how often a hand wins at showdown"""
+
+from engine.equity.monte_carlo import EquityResult, estimate_equity
+from engine.equity.exact import exact_equity
+from engine.equity.heads_up import heads_up_equity
+from engine.equity.ranges import range_equity
+from engine.equity.hand_potential import HandStrength, hand_strength
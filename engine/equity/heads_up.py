@@ -0,0 +1,185 @@
+"""
+The heads up module serves the exact preflop all-in equity of every hole card
+combo against every other from a [1326, 1326] matrix, so a heads up preflop
+all-in costs two combo indices and one array read.
+
+The matrix is built once by enumerating every runout with
+:func:`engine.equity.exact.exact_equity`, but only for the matchups that are
+unique under suit isomorphism: relabelling the suits of both hands the same way
+does not change the equity, and the equity of b against a is one minus the
+equity of a against b. That leaves 47,008 of the 1,624,350 matchups to
+enumerate, at a couple of seconds each. Entries of combos sharing a card are NaN.
+
+The matrix is built and saved with:
+    python -m engine.equity.heads_up [processes] [float16|float32]
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Sequence, Tuple, Union
+import itertools
+import os
+import sys
+
+import numpy as np
+
+from engine.card.card import Card
+from engine.card.combos import (
+    CARD_COMBOS,
+    COMBO_CARD_INDICES,
+    COMBO_INDEX,
+    NUM_COMBOS,
+    combo_cards,
+    combo_index,
+)
+from engine.equity.exact import exact_equity
+
+HEADS_UP_EQUITY_PATH = Path(__file__).with_name("heads_up_equity.npy")
+
+
+def _suit_permuted_combos() -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: A [24, 1326] array, the combo every combo becomes under each
+            of the 24 relabellings of the suits
+    """
+    ranks, suits = np.divmod(COMBO_CARD_INDICES, 4)
+    return np.stack(
+        [
+            COMBO_INDEX[
+                ranks[:, 0] * 4 + np.take(permutation, suits[:, 0]),
+                ranks[:, 1] * 4 + np.take(permutation, suits[:, 1]),
+            ]
+            for permutation in itertools.permutations(range(4))
+        ]
+    )
+
+
+def canonical_matchups() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the matchups that are unique under suit isomorphism.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - [M, 2] the hero and villain combo of every unique matchup
+            - [1326, 1326] the unique matchup every matchup maps to, -1 where the
+              combos share a card
+            - [1326, 1326] whether the matchup maps to it with hero and villain
+              swapped
+    """
+    permuted = _suit_permuted_combos()
+    conflicts = (CARD_COMBOS.T.astype(np.uint8) @ CARD_COMBOS.astype(np.uint8)) > 0
+
+    keys = np.full((NUM_COMBOS, NUM_COMBOS), np.iinfo(np.int64).max, dtype=np.int64)
+    for hero in range(NUM_COMBOS):
+        # smallest hero * 1326 + villain the matchup and its relabellings map to
+        keys[hero] = (permuted[:, [hero]] * NUM_COMBOS + permuted).min(axis=0)
+
+    swapped = keys.T < keys
+    keys = np.minimum(keys, keys.T)
+    keys[conflicts] = -1
+
+    unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(keys.shape) - 1
+    matchups = np.stack(np.divmod(unique[1:], NUM_COMBOS), axis=1)
+    return matchups, inverse, swapped
+
+
+def _matchup_equities(matchups: np.ndarray) -> List[float]:
+    """
+    Returns:
+        list[float]: The exact equity of the hero of every given matchup
+    """
+    return [
+        exact_equity([combo_cards(hero), combo_cards(villain)])[0].equity
+        for hero, villain in matchups
+    ]
+
+
+def build_heads_up_matrix(
+    processes: int = 1, dtype: np.dtype = np.float32, chunk_size: int = 64
+) -> np.ndarray:
+    """
+    Arguments:
+        processes (int): Enumerate the matchups over a pool of this many
+            processes, defaults to 1 (enumerate in this process)
+        dtype (np.dtype): float16 or float32, defaults to float32
+        chunk_size (int): Matchups per task sent to the pool
+    Returns:
+        np.ndarray: The [1326, 1326] equity matrix
+    """
+    matchups, inverse, swapped = canonical_matchups()
+    chunks = [
+        matchups[start : start + chunk_size]
+        for start in range(0, len(matchups), chunk_size)
+    ]
+    if processes > 1:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(_matchup_equities, chunks))
+    else:
+        results = [_matchup_equities(chunk) for chunk in chunks]
+
+    equities = np.array(list(itertools.chain.from_iterable(results)) + [np.nan])
+    matrix = equities[inverse]
+    matrix = np.where(swapped, 1 - matrix, matrix)
+    return matrix.astype(dtype)
+
+
+def load_heads_up_matrix(
+    path: Union[str, os.PathLike] = HEADS_UP_EQUITY_PATH
+) -> np.ndarray:
+    """
+    Arguments:
+        path (Union[str, os.PathLike]): The matrix to map
+    Returns:
+        np.ndarray: The read-only, memory mapped [1326, 1326] equity matrix
+    Raises:
+        OSError: If the matrix does not exist, see the module docstring to build it
+        ValueError: If the matrix has the wrong shape or type
+    """
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.shape != (NUM_COMBOS, NUM_COMBOS) or matrix.dtype not in (
+        np.float16,
+        np.float32,
+    ):
+        raise ValueError(
+            f"Invalid heads up matrix {path}: {matrix.shape} {matrix.dtype}"
+        )
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def heads_up_matrix() -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: The default equity matrix, mapped on first use
+    """
+    return load_heads_up_matrix()
+
+
+def heads_up_equity(hand: Sequence[Card], other: Sequence[Card]) -> float:
+    """
+    Arguments:
+        hand (Sequence[Card]): Two hole cards
+        other (Sequence[Card]): The two hole cards all-in against them
+    Returns:
+        float: The preflop all-in equity of hand against other
+    Raises:
+        ValueError: If the hands share a card
+    """
+    equity = float(heads_up_matrix()[combo_index(hand), combo_index(other)])
+    if equity != equity:
+        raise ValueError(
+            f"Hands {list(map(str, hand))} and {list(map(str, other))} share a card"
+        )
+    return equity
+
+
+if __name__ == "__main__":
+    num_processes = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    matrix_dtype = np.dtype(sys.argv[2]) if len(sys.argv) > 2 else np.float32
+    np.save(HEADS_UP_EQUITY_PATH, build_heads_up_matrix(num_processes, matrix_dtype))
+    print(f"wrote {HEADS_UP_EQUITY_PATH}")
@@ -0,0 +1,209 @@
+"""
+Monte Carlo equity of a hand against random opponent hands.
+
+Runouts are sampled in blocks and ranked with
+:func:`engine.evaluator.batch.evaluate_batch`, so a block of thousands of
+runouts costs a handful of array operations. After every block the 95%
+confidence interval of the equity is checked, and sampling stops as soon as
+it is narrower than the requested margin. Callers trade accuracy for latency
+through that margin.
+
+Large jobs can be spread over a process pool: every round submits one block
+per worker, each with its own independent random stream.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+from engine.card.card import Card
+from engine.card.card_set import CardSet
+from engine.evaluator.batch import evaluate_batch
+
+Z_95 = 1.959963984540054
+"""Two sided 95% quantile of the standard normal distribution"""
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    """The outcome of an equity estimate."""
+
+    win: float
+    """Probability the hand wins outright"""
+
+    tie: float
+    """Probability the hand ties for the best hand"""
+
+    equity: float
+    """Expected share of the pot, ties split between the tied hands"""
+
+    samples: int
+    """The number of runouts sampled"""
+
+    margin: float
+    """Half width of the 95% confidence interval of the equity"""
+
+
+def remaining_deck(dead_cards: Sequence[Card]) -> np.ndarray:
+    """
+    Arguments:
+        dead_cards (Sequence[Card]): Cards that cannot be dealt
+    Returns:
+        np.ndarray: The int64 card ints of the rest of the deck
+    Raises:
+        ValueError: If dead_cards contains duplicates
+    """
+    dead = CardSet(dead_cards)
+    if len(dead) != len(dead_cards):
+        raise ValueError(f"Duplicate cards in {[str(card) for card in dead_cards]}")
+
+    # card index order, as Deck._get_full_deck()
+    return np.array(dead.complement().to_list(), dtype=np.int64)
+
+
+def _simulate_block(
+    hand: Tuple[int, ...],
+    board: Tuple[int, ...],
+    num_opponents: int,
+    num_samples: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[int, int, float, float]:
+    """
+    Samples num_samples runouts and opponent hands.
+
+    Returns:
+        Tuple[int, int, float, float]: wins, ties, sum of equity, sum of squared equity
+    """
+    rng = np.random.default_rng(seed)
+    deck = remaining_deck(hand + board)
+    num_board = 5 - len(board)
+
+    dealt = rng.permuted(np.tile(deck, (num_samples, 1)), axis=1)
+    known_board = np.broadcast_to(
+        np.array(board, dtype=np.int64), (num_samples, len(board))
+    )
+    runouts = np.concatenate((known_board, dealt[:, :num_board]), axis=1)
+
+    hero = evaluate_batch(np.broadcast_to(np.array(hand), (num_samples, 2)), runouts)
+    opponents = np.stack(
+        [
+            evaluate_batch(dealt[:, num_board + 2 * i : num_board + 2 * i + 2], runouts)
+            for i in range(num_opponents)
+        ],
+        axis=1,
+    )
+
+    best_opponent = opponents.min(axis=1)
+    wins = hero < best_opponent
+    ties = hero == best_opponent
+    equity = wins + ties / (1 + (opponents == hero[:, None]).sum(axis=1))
+    return (
+        int(wins.sum()),
+        int(ties.sum()),
+        float(equity.sum()),
+        float((equity**2).sum()),
+    )
+
+
+def estimate_equity(
+    hand: List[Card],
+    board: Optional[List[Card]] = None,
+    num_opponents: int = 1,
+    margin: float = 0.01,
+    max_samples: int = 1_000_000,
+    block_size: int = 10_000,
+    processes: int = 1,
+    executor: Optional[Executor] = None,
+    seed: Optional[int] = None,
+) -> EquityResult:
+    # pylint: disable=too-many-arguments,too-many-locals
+    """
+    Estimates the equity of hand against num_opponents random hands.
+
+    Arguments:
+        hand (list[Card]): The two hole cards
+        board (list[Card], optional): The 0, 3, 4 or 5 board cards dealt so far
+        num_opponents (int): How many random hands to play against, defaults to 1
+        margin (float): Stop once the 95% confidence interval of the equity is
+            within +/- margin, defaults to 0.01. Use 0 to always sample max_samples.
+        max_samples (int): The most runouts to sample, defaults to 1,000,000
+        block_size (int): Runouts per vectorized block, defaults to 10,000
+        processes (int): Spread the blocks over a pool of this many processes,
+            defaults to 1 (sample in this process)
+        executor (Executor, optional): A pool to reuse instead of starting one
+            for this call. Each round submits `processes` blocks to it.
+        seed (int, optional): Seed for reproducible estimates
+    Returns:
+        EquityResult: The estimated win, tie and equity
+    Raises:
+        ValueError: If the cards are invalid or there are not enough cards left
+            to deal the opponents
+    """
+    board = board or []
+    if len(hand) != 2:
+        raise ValueError(f"Expected 2 hole cards, got {len(hand)}")
+    if len(board) not in (0, 3, 4, 5):
+        raise ValueError(f"Expected 0, 3, 4 or 5 board cards, got {len(board)}")
+    num_left = len(remaining_deck(hand + board))
+    if num_opponents < 1 or 5 - len(board) + 2 * num_opponents > num_left:
+        raise ValueError(f"Cannot deal {num_opponents} opponents")
+
+    args = (tuple(hand), tuple(board), num_opponents)
+    seed_sequence = np.random.SeedSequence(seed)
+
+    own_executor = None
+    if executor is None and processes > 1:
+        executor = own_executor = ProcessPoolExecutor(processes)
+
+    wins = ties = samples = 0
+    equity_sum = equity_sq_sum = 0.0
+    half_width = math.inf
+    try:
+        while samples < max_samples:
+            # one block per worker and round
+            sizes = []
+            for _ in range(processes if executor is not None else 1):
+                size = min(block_size, max_samples - samples - sum(sizes))
+                if size > 0:
+                    sizes.append(size)
+            block_args = [
+                (*args, size, block_seed)
+                for size, block_seed in zip(sizes, seed_sequence.spawn(len(sizes)))
+            ]
+
+            if executor is not None:
+                futures = [executor.submit(_simulate_block, *arg) for arg in block_args]
+                results = (future.result() for future in futures)
+            else:
+                results = (_simulate_block(*arg) for arg in block_args)
+
+            for (block_wins, block_ties, block_sum, block_sq_sum), size in zip(
+                results, sizes
+            ):
+                wins += block_wins
+                ties += block_ties
+                equity_sum += block_sum
+                equity_sq_sum += block_sq_sum
+                samples += size
+
+            mean = equity_sum / samples
+            variance = max(equity_sq_sum / samples - mean**2, 0.0)
+            half_width = Z_95 * math.sqrt(variance / samples)
+            if half_width <= margin:
+                break
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown()
+
+    return EquityResult(
+        win=wins / samples,
+        tie=ties / samples,
+        equity=equity_sum / samples,
+        samples=samples,
+        margin=half_width,
+    )
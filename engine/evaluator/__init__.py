@@ -1,7 +1,13 @@
 """The evaluator package"""
 
 from engine.evaluator.evaluator import (
+    backend,
     evaluate,
     rank_to_string,
     get_five_card_rank_percentage,
 )
+from engine.evaluator.batch import evaluate_batch
+from engine.evaluator.incremental import IncrementalEvaluator
+from engine.evaluator.preflop_table import preflop_equity
+from engine.evaluator.board_cache import BoardRankCache, board_ranks
+from engine.evaluator.memo import EVALUATION_CACHE, EvaluationCache, cached_evaluate
@@ -0,0 +1,128 @@
+"""
+An alternative, array backed layout of the lookup tables.
+
+The :class:`LookupTable` dicts are keyed by prime products, so every entry costs
+a hashed int key, an int value and a hash slot. Here both tables are flat
+``array('H')`` buffers of 2 bytes per entry instead:
+    - flushes: the dense 8192 entry table indexed by the 13 bit rank mask
+    - unsuited hands: indexed by a minimal perfect hash of the sorted ranks
+
+The perfect hash is the combinatorial number system for multisets, see
+:mod:`engine.evaluator.rank_multiset`.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional
+
+from engine.card.card import Card
+from engine.evaluator.lookup_table import LOOKUP_TABLE, LookupTable
+from engine.evaluator.rank_multiset import (  # pylint: disable=unused-import
+    MULTISET_OFFSETS,
+    MULTISET_SIZES,
+    NUM_MULTISETS,
+    POSITION_KEYS,
+    rank_multiset_index,
+    unsuited_multiset_ranks,
+)
+from engine.evaluator.table_file import TableArrays
+
+
+class ArrayLookupTable(LookupTable):
+    # pylint: disable=super-init-not-called
+    """
+    The lookup tables as two flat uint16 arrays. Answers the same
+    :meth:`LookupTable.flush_rank` and :meth:`LookupTable.unsuited_rank` queries
+    but does not keep the prime product dicts.
+    """
+
+    def __init__(
+        self,
+        tables: Optional[TableArrays] = None,
+        source: Optional[LookupTable] = None,
+    ):
+        """
+        Arguments:
+            tables (TableArrays, optional): Mapped tables to use without copying
+            source (LookupTable, optional): The table to convert if tables is not
+                given, defaults to LOOKUP_TABLE.
+        """
+        self.tables = tables
+        if tables is not None:
+            self.flush_rankbits_lookup = tables.flush_rankbits
+            self.unsuited_multiset_lookup = tables.unsuited_multisets
+            self.rank_class_lookup = tables.rank_classes
+            return
+
+        if source is None:
+            source = LOOKUP_TABLE
+        self.flush_rankbits_lookup = array("H", source.flush_rankbits_lookup)
+        self.unsuited_multiset_lookup = unsuited_multiset_ranks(source)
+        self.rank_class_lookup = array("B", source.rank_class_lookup)
+
+    def unsuited_rank(self, cards: List[Card]) -> int:
+        """
+        Arguments:
+            cards (list[Card]): 5, 6 or 7 cards
+        Returns:
+            int: The rank of the best 5 cards, assuming they make no flush
+        """
+        return self.unsuited_multiset_lookup[
+            rank_multiset_index((c >> 8) & 0xF for c in cards)
+        ]
+
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: The number of bytes in the table buffers
+        """
+        return sum(
+            memoryview(buffer).nbytes
+            for buffer in (
+                self.flush_rankbits_lookup,
+                self.unsuited_multiset_lookup,
+                self.rank_class_lookup,
+            )
+        )
+
+
+if __name__ == "__main__":
+    # --- memory and lookup speed of both layouts --- #
+    import random
+    import sys
+    import timeit
+
+    from engine.card.deck import Deck
+
+    def _deep_size(table: dict) -> int:
+        return sys.getsizeof(table) + sum(
+            sys.getsizeof(key) + sys.getsizeof(value) for key, value in table.items()
+        )
+
+    array_table = ArrayLookupTable()
+    dict_table = LookupTable()
+    dict_bytes = _deep_size(dict_table.flush_lookup) + _deep_size(
+        dict_table.unsuited_lookup
+    )
+    print(f"dict layout:  {dict_bytes:>10,} bytes (prime product dicts)")
+    print(f"array layout: {array_table.nbytes():>10,} bytes (all buffers)")
+
+    # pylint: disable=protected-access
+    rng = random.Random(0)
+    deck = Deck._get_full_deck()
+    for n_cards in MULTISET_SIZES:
+        hands = [rng.sample(deck, n_cards) for _ in range(100_000)]
+        for table in (LOOKUP_TABLE, array_table):
+            assert all(
+                table.unsuited_rank(hand) == LOOKUP_TABLE.unsuited_rank(hand)
+                for hand in hands
+            )
+            seconds = timeit.timeit(
+                lambda table=table: [table.unsuited_rank(hand) for hand in hands],
+                number=1,
+            )
+            print(
+                f"{n_cards} cards, {type(table).__name__:>16}.unsuited_rank: "
+                f"{len(hands) / seconds:,.0f} lookups/s"
+            )
@@ -0,0 +1,194 @@
+"""
+The benchmark module measures the evaluator, so changes to it can be checked
+for speed regressions:
+    - evaluate on 5, 6 and 7 card hands (hands/s)
+    - _two and get_rank_class (calls/s)
+    - building the lookup tables and loading them from a table file (s)
+
+Card sets come from a fixed seed, so runs compare like for like. Each
+throughput is the best of a few repeats. Results are written as JSON, and
+compare mode fails when a result is worse than a baseline by more than a
+threshold:
+
+    python -m engine.evaluator.benchmark --output baseline.json
+    python -m engine.evaluator.benchmark --compare baseline.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from engine.card.combos import CARDS
+from engine.evaluator import evaluator, table_file
+from engine.evaluator.evaluator import evaluate, get_rank_class
+from engine.evaluator.lookup_table import LookupTable
+
+DEFAULT_NUM_HANDS = 100_000
+DEFAULT_REPEAT = 5
+DEFAULT_SEED = 7462
+DEFAULT_THRESHOLD = 0.1
+
+Result = Dict[str, object]
+"""value, unit and whether higher is better"""
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    """
+    Returns:
+        float: The fastest of repeat timed calls, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _throughput(count: int, seconds: float) -> Result:
+    return {"value": count / seconds, "unit": "per_s", "higher_is_better": True}
+
+
+def _duration(seconds: float) -> Result:
+    return {"value": seconds, "unit": "s", "higher_is_better": False}
+
+
+def _format(value: float, result: Result) -> str:
+    if result["unit"] == "s":
+        return f"{value * 1000:.2f}ms"
+    return f"{value:,.0f}/s"
+
+
+def run_benchmarks(
+    num_hands: int = DEFAULT_NUM_HANDS,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Result]:
+    """
+    Arguments:
+        num_hands (int): Card sets per throughput benchmark
+        repeat (int): Timed repeats per benchmark, the best is kept
+        seed (int): Seed of the card sets
+    Returns:
+        dict[str, Result]: Every benchmark's result by name
+    """
+    # pylint: disable=protected-access
+    rng = random.Random(seed)
+    results: Dict[str, Result] = {}
+
+    for num_cards in (5, 6, 7):
+        hands = [rng.sample(CARDS, num_cards) for _ in range(num_hands)]
+        pairs = [(hand[:2], hand[2:]) for hand in hands]
+        seconds = _best_time(
+            lambda pairs=pairs: [evaluate(cards, board) for cards, board in pairs],
+            repeat,
+        )
+        results[f"evaluate_{num_cards}_cards"] = _throughput(num_hands, seconds)
+
+    hole_cards = [rng.sample(CARDS, 2) for _ in range(num_hands)]
+    seconds = _best_time(
+        lambda: [evaluator._two(cards) for cards in hole_cards], repeat
+    )
+    results["two"] = _throughput(num_hands, seconds)
+
+    hand_ranks = [rng.randint(1, 7462) for _ in range(num_hands)]
+    seconds = _best_time(lambda: [get_rank_class(rank) for rank in hand_ranks], repeat)
+    results["get_rank_class"] = _throughput(num_hands, seconds)
+
+    results["table_build"] = _duration(_best_time(LookupTable, repeat))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "lookup_table.bin"
+        table_file.save_tables(LookupTable(), path)
+        results["table_load"] = _duration(
+            _best_time(lambda: LookupTable(table_file.load_tables(path)), repeat)
+        )
+
+    return results
+
+
+def compare(
+    results: Dict[str, Result],
+    baseline: Dict[str, Result],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Arguments:
+        results (dict[str, Result]): The results of this run
+        baseline (dict[str, Result]): The results to compare against
+        threshold (float): The largest allowed relative slowdown, i.e. 0.1 for
+            10% fewer hands/s or 10% longer table loads
+    Returns:
+        list[str]: A message for every benchmark that regressed, empty if none did
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        value, base = result["value"], baseline[name]["value"]
+        if result["higher_is_better"]:
+            change = base / value - 1
+        else:
+            change = value / base - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {_format(value, result)} against {_format(base, result)}, "
+                f"{change:.1%} worse"
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the benchmarks from the command line.
+
+    Returns:
+        int: The exit code, 1 if compare mode found a regression
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, help="write the results here")
+    parser.add_argument("--compare", type=Path, help="baseline results to check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="largest allowed relative slowdown against the baseline",
+    )
+    parser.add_argument("--hands", type=int, default=DEFAULT_NUM_HANDS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.hands, args.repeat, args.seed)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "backend": evaluator.backend(),
+        "hands": args.hands,
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    print(text)
+
+    if args.compare is None:
+        return 0
+
+    baseline = json.loads(args.compare.read_text())["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
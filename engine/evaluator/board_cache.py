@@ -0,0 +1,167 @@
+"""
+The board cache module ranks every hole card combo on a board once and keeps
+the ranks for the next showdown, equity check or bucketing call on the same
+board.
+
+The first lookup on a board ranks all the combos that do not share a card with
+it in a single :func:`engine.evaluator.batch.evaluate_batch` call, into a dense
+[1326] int16 array indexed by combo (see :mod:`engine.card.combos`). Combos
+holding a board card get rank 0. Every later lookup on that board is one index.
+Boards are evicted least recently used first once the cache outgrows its
+memory cap.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Sequence
+
+import numpy as np
+
+from engine.card.card import Card
+from engine.card.combos import (
+    CARD_INDEX,
+    COMBO_CARDS,
+    NUM_COMBOS,
+    blocked_combos,
+    combo_index,
+)
+from engine.evaluator.batch import evaluate_batch
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+class BoardRankCache:
+    """
+    A least recently used cache of the ranks of every combo on a board.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Arguments:
+            max_bytes (int): Keep at most this many bytes of rank arrays, defaults
+                to 64 MiB (about 25,000 boards)
+        Raises:
+            ValueError: If max_bytes cannot hold a single board
+        """
+        self.max_boards = max_bytes // (NUM_COMBOS * np.dtype(np.int16).itemsize)
+        if self.max_boards < 1:
+            raise ValueError(f"max_bytes of {max_bytes} cannot hold a single board")
+
+        self._boards: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def ranks(self, board: Sequence[Card]) -> np.ndarray:
+        """
+        Arguments:
+            board (Sequence[Card]): 3, 4 or 5 board cards, in any order
+        Returns:
+            np.ndarray: A read-only [1326] int16 array, the rank (see
+                :func:`engine.evaluator.evaluator.evaluate`) of every combo on the
+                board by combo index, 0 for the combos holding a board card
+        Raises:
+            ValueError: If the board has the wrong length or repeats a card
+        """
+        if len(board) not in (3, 4, 5):
+            raise ValueError(f"Expected 3, 4 or 5 board cards, got {len(board)}")
+        key = 0
+        for card in board:
+            key |= 1 << CARD_INDEX[card]
+        if bin(key).count("1") != len(board):
+            raise ValueError(f"Duplicate cards in {[str(card) for card in board]}")
+
+        ranks = self._boards.get(key)
+        if ranks is not None:
+            self.hits += 1
+            self._boards.move_to_end(key)
+            return ranks
+
+        self.misses += 1
+        live = np.flatnonzero(~blocked_combos(board))
+        ranks = np.zeros(NUM_COMBOS, dtype=np.int16)
+        ranks[live] = evaluate_batch(
+            COMBO_CARDS[live],
+            np.broadcast_to(np.array(board, dtype=np.int64), (len(live), len(board))),
+        )
+        ranks.flags.writeable = False
+
+        self._boards[key] = ranks
+        if len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+        return ranks
+
+    def rank(self, hand: Sequence[Card], board: Sequence[Card]) -> int:
+        """
+        Arguments:
+            hand (Sequence[Card]): Two hole cards
+            board (Sequence[Card]): 3, 4 or 5 board cards
+        Returns:
+            int: The rank of hand on board, as
+                :func:`engine.evaluator.evaluator.evaluate`
+        Raises:
+            ValueError: If the cards are invalid or the hand holds a board card
+        """
+        rank = int(self.ranks(board)[combo_index(hand)])
+        if rank == 0:
+            raise ValueError(
+                f"Hand {[str(card) for card in hand]} holds a card of the board"
+            )
+        return rank
+
+    def clear(self):
+        """
+        Drops every board and resets the counters.
+        """
+        self._boards.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def __repr__(self) -> str:
+        return (
+            f"BoardRankCache({len(self)}/{self.max_boards} boards, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+
+BOARD_RANK_CACHE = BoardRankCache()
+"""The shared cache"""
+
+
+def board_ranks(board: Sequence[Card]) -> np.ndarray:
+    """
+    Arguments:
+        board (Sequence[Card]): 3, 4 or 5 board cards
+    Returns:
+        np.ndarray: The [1326] ranks of every combo on board from the shared cache,
+            see :meth:`BoardRankCache.ranks`
+    """
+    return BOARD_RANK_CACHE.ranks(board)
+
+
+if __name__ == "__main__":
+    # --- cold and warm lookups on random rivers --- #
+    import random
+    import timeit
+
+    from engine.card.combos import CARDS, combo_cards
+    from engine.evaluator.evaluator import evaluate
+
+    rng = random.Random(0)
+    rivers = [rng.sample(CARDS, 5) for _ in range(1000)]
+    hands = [combo_cards(i) for i in range(NUM_COMBOS)]
+    for river in rivers[:20]:
+        ranks = board_ranks(river)
+        assert all(
+            ranks[i] == (0 if set(hand) & set(river) else evaluate(hand, river))
+            for i, hand in enumerate(hands)
+        )
+
+    BOARD_RANK_CACHE.clear()
+    cold = timeit.timeit(lambda: [board_ranks(river) for river in rivers], number=1)
+    warm = timeit.timeit(lambda: [board_ranks(river) for river in rivers], number=1)
+    print(f"cold: {cold / len(rivers) * 1e6:.1f}us per board, ranks all combos")
+    print(f"warm: {warm / len(rivers) * 1e6:.1f}us per board")
+    print(BOARD_RANK_CACHE)
@@ -8,30 +8,79 @@ consequent evaluations are very fast. Won't beat C, but very fast as
 all calculations are done with bit arithmetic and table lookups.
 """
 
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
-import itertools
 from engine.card import card
 from engine.card.card import Card
+from engine.card.card_set import CardSet
+from engine.evaluator import jit
 from engine.evaluator.lookup_table import LOOKUP_TABLE
-from engine.evaluator.two_lookup_table import two_suited, two_unsuited
+from engine.evaluator.preflop_table import preflop_percentile
+
+BACKENDS = ("python", "numba")
+"""Backends of :func:`evaluate`, see :func:`backend`"""
+
+
+def _load_kernel(cards: np.ndarray) -> int:
+    """
+    The kernel until the first 6 or 7 card hand: loads the numba kernel, so
+    importing the evaluator does not import numba, then ranks the hand.
+    """
+    global _kernel  # pylint: disable=global-statement
+    _kernel = jit.load()
+    if _kernel is None:
+        return _seven([Card.from_int(card_int) for card_int in cards.tolist()])
+    return _kernel(cards)
+
+
+_kernel = _load_kernel
 
 
-def _two(cards: List[Card]) -> int:
+def backend() -> str:
+    """
+    Returns:
+        str: The backend :func:`evaluate` ranks 6 and 7 card hands with, "numba"
+            when numba is installed and "python" otherwise. 5 card hands are a
+            single table lookup, faster in Python than a call into the kernel.
+    """
+    if _kernel is _load_kernel:
+        return "numba" if jit.available() else "python"
+    return "python" if _kernel is None else "numba"
+
+
+def set_backend(name: Optional[str] = None):
+    """
+    Switches the backend of :func:`evaluate`, e.g. to benchmark both. Ranks are
+    identical either way.
+
+    Args:
+        name (str, optional): One of BACKENDS, or None for the fastest available
+    Raises:
+        ValueError: If the backend is unknown or its dependency is not installed
     """
-    Using lookup table, return percentile of your hand with two cards
+    global _kernel  # pylint: disable=global-statement
+    if name not in (None, *BACKENDS):
+        raise ValueError(f"Unknown backend {name!r}, expected one of {BACKENDS}")
+    if name == "python":
+        _kernel = None
+        return
+    kernel = jit.load()
+    if name == "numba" and kernel is None:
+        raise ValueError("The numba backend needs numba to be installed")
+    _kernel = kernel
+
+
+def _two(cards: List[Card]) -> float:
+    """
+    Using the preflop equity table, return the percentile of your hand with two
+    cards: the fraction of hole cards with a lower heads-up all-in equity.
     """
     if len(cards) != 2:
         raise ValueError("Only 2-card hands are supported by the Two evaluator")
-    
-    r0, r1 = cards[0].rank , cards[1].rank
-    if cards[0].suit == cards[1].suit:
-        if r0 < r1:
-            return two_suited[r0][r1]
-        else:
-            return two_suited[r1][r0]
-    else:
-        return two_unsuited[r0][r1]
+
+    return preflop_percentile(cards)
 
 
 def _five(cards: List[Card]) -> int:
@@ -47,8 +96,32 @@ def _five(cards: List[Card]) -> int:
     # if flush
     if cards[0] & cards[1] & cards[2] & cards[3] & cards[4] & 0xF000:
         hand_or = (cards[0] | cards[1] | cards[2] | cards[3] | cards[4]) >> 16
-        prime = card.prime_product_from_rankbits(hand_or)
-        return LOOKUP_TABLE.flush_lookup[prime]
+        return LOOKUP_TABLE.flush_rankbits_lookup[hand_or]
+
+    # otherwise
+    prime = card.prime_product_from_hand(cards)
+    return LOOKUP_TABLE.unsuited_lookup[prime]
+
+
+def _seven(cards: List[Card]) -> int:
+    """
+    Performs an evaluation of a 6 or 7 card hand with a single table lookup,
+    returning the same rank as the best of its 5 card subsets.
+    Args:
+        cards (list[Card]): A list of 6 or 7 card ints.
+    Returns:
+        int: The rank of the hand.
+    """
+    # with at most 7 cards, only one suit can make a flush, and a hand
+    # holding a flush cannot also hold a full house or four of a kind
+    suits = [c & 0xF000 for c in cards]
+    for suit in set(suits):
+        if suits.count(suit) >= 5:
+            hand_or = 0
+            for c in cards:
+                if c & suit:
+                    hand_or |= c
+            return LOOKUP_TABLE.flush_rankbits_lookup[hand_or >> 16]
 
     # otherwise
     prime = card.prime_product_from_hand(cards)
@@ -60,17 +133,25 @@ def evaluate(cards: List[Card], board: List[Card]) -> int:
     Evaluates hand strengths using a variant of Cactus Kev's algorithm:
     http://www.suffecool.net/poker/evaluator.html
     Args:
-        cards (list[int]): A list of length two of card ints that a player holds.
-        board (list[int]): A list of length 3, 4, or 5 of card ints.
+        cards (list[int]): A list of length two of card ints that a player holds,
+            or a :class:`~engine.card.card_set.CardSet`.
+        board (list[int]): A list of length 3, 4, or 5 of card ints, or a CardSet.
     Returns:
         int: A number between 1 (highest) and 7462 (lowest) representing the relative
             hand rank of the given card.
     """
     if not board:
-        return 7462 - round(_two(cards) * 7462)
-    
-    all_cards = cards + board
-    return min([_five(hand) for hand in itertools.combinations(all_cards, 5)])
+        return 7462 - round(_two(list(cards)) * 7462)
+
+    if isinstance(cards, CardSet) or isinstance(board, CardSet):
+        all_cards = list(cards) + list(board)
+    else:
+        all_cards = cards + board
+    if len(all_cards) == 5:
+        return _five(all_cards)
+    if _kernel is not None:
+        return _kernel(np.fromiter(all_cards, np.int64, len(all_cards)))
+    return _seven(all_cards)
 
 
 def get_rank_class(hand_rank: int) -> int:
@@ -78,8 +159,7 @@ def get_rank_class(hand_rank: int) -> int:
     Returns the class of hand given the hand hand_rank
     returned from evaluate.
     """
-    max_rank = min(rank for rank in LOOKUP_TABLE.MAX_TO_RANK_CLASS if hand_rank <= rank)
-    return LOOKUP_TABLE.MAX_TO_RANK_CLASS[max_rank]
+    return LOOKUP_TABLE.rank_class_lookup[hand_rank]
 
 
 def rank_to_string(hand_rank: int) -> str:
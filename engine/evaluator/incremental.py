@@ -0,0 +1,141 @@
+"""
+The incremental module keeps a player's hand strength up to date as the board
+is dealt. Instead of re-evaluating hole cards + board on every street, an
+:class:`IncrementalEvaluator` keeps the running prime product of the ranks and
+the rank bits of every suit, so each new card costs a few integer operations
+and the rank is one table lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Tuple
+
+from engine.card.card import Card
+from engine.evaluator.evaluator import _two
+from engine.evaluator.lookup_table import LOOKUP_TABLE
+
+EvaluatorSnapshot = Tuple[
+    Tuple[Card, ...], int, Tuple[int, ...], Tuple[int, ...], Optional[int]
+]
+"""The cards, prime product, suit counts, suit rank bits and cached rank"""
+
+
+class IncrementalEvaluator:
+    """
+    Seed with the hole cards, then call :meth:`add_card` for every board card.
+    :meth:`rank` always agrees with
+    :func:`engine.evaluator.evaluator.evaluate` (hole cards, board so far).
+    """
+
+    __slots__ = ("cards", "_prime_product", "_suit_counts", "_suit_rankbits", "_rank")
+
+    def __init__(self, hole_cards: Iterable[Card]):
+        """
+        Arguments:
+            hole_cards (Iterable[Card]): The two cards the player holds
+        Raises:
+            ValueError: If not given exactly two cards
+        """
+        self.cards: List[Card] = []
+        self._prime_product = 1
+
+        # indexed by the suit nibble (1, 2, 4, 8)
+        self._suit_counts = [0] * 9
+        self._suit_rankbits = [0] * 9
+
+        self._rank: Optional[int] = None
+        self.add_cards(hole_cards)
+
+        if len(self.cards) != 2:
+            raise ValueError(f"Expected 2 hole cards, got {len(self.cards)}")
+
+    def add_card(self, card: Card):
+        """
+        Adds a board card.
+
+        Arguments:
+            card (Card): The new card
+        Raises:
+            ValueError: If the hand already holds 7 cards
+        """
+        if len(self.cards) >= 7:
+            raise ValueError("Cannot add more than 7 cards to a hand")
+
+        suit = (card >> 12) & 0xF
+        self.cards.append(card)
+        self._prime_product *= card & 0xFF
+        self._suit_counts[suit] += 1
+        self._suit_rankbits[suit] |= (card >> 16) & 0x1FFF
+        self._rank = None
+
+    def add_cards(self, cards: Iterable[Card]):
+        """
+        Arguments:
+            cards (Iterable[Card]): The new board cards, i.e. a whole flop
+        """
+        for card in cards:
+            self.add_card(card)
+
+    def rank(self) -> int:
+        """
+        Returns:
+            int: A number between 1 (highest) and 7462 (lowest) representing the
+                relative hand rank of the cards so far. With no board this is the
+                preflop rank of the hole cards.
+        Raises:
+            ValueError: If the board has 1 or 2 cards
+        """
+        if self._rank is not None:
+            return self._rank
+
+        num_cards = len(self.cards)
+        if num_cards == 2:
+            self._rank = 7462 - round(_two(self.cards) * 7462)
+        elif num_cards < 5:
+            raise ValueError(f"Cannot rank a hand of {num_cards} cards")
+        else:
+            self._rank = LOOKUP_TABLE.unsuited_lookup[self._prime_product]
+            for suit in (1, 2, 4, 8):
+                # with at most 7 cards, only one suit can make a flush
+                if self._suit_counts[suit] >= 5:
+                    self._rank = LOOKUP_TABLE.flush_rankbits_lookup[
+                        self._suit_rankbits[suit]
+                    ]
+                    break
+
+        return self._rank
+
+    def snapshot(self) -> EvaluatorSnapshot:
+        """
+        Returns:
+            EvaluatorSnapshot: The state of the evaluator as a flat tuple, for
+                :meth:`from_snapshot`
+        """
+        return (
+            tuple(self.cards),
+            self._prime_product,
+            tuple(self._suit_counts),
+            tuple(self._suit_rankbits),
+            self._rank,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: EvaluatorSnapshot) -> IncrementalEvaluator:
+        """
+        Arguments:
+            snapshot (EvaluatorSnapshot): As given by :meth:`snapshot`
+        Returns:
+            IncrementalEvaluator: An evaluator in the captured state, without
+                adding the cards again
+        """
+        cards, prime_product, suit_counts, suit_rankbits, rank = snapshot
+        evaluator = cls.__new__(cls)
+        evaluator.cards = list(cards)
+        evaluator._prime_product = prime_product
+        evaluator._suit_counts = list(suit_counts)
+        evaluator._suit_rankbits = list(suit_rankbits)
+        evaluator._rank = rank
+        return evaluator
+
+    def __repr__(self) -> str:
+        return f"IncrementalEvaluator({[str(card) for card in self.cards]})"
@@ -18,13 +18,62 @@ Here we create a lookup table which maps:
 Examples:
 * Royal flush (best hand possible)          => 1
 * 7-5-4-3-2 unsuited (worst hand possible)  => 7462
+
+The 5 card tables are then extended to 6 and 7 card hands, so a hand on the
+turn or river is ranked with a single lookup instead of one per 5 card subset:
+    6 or 7 card hand's unique prime product => rank of its best 5 cards
+    13 bit rank mask of a flush suit         => rank of its best 5 card flush
+
+Building the tables takes a noticeable fraction of a second, so on import we
+memory-map them from the file written by :mod:`engine.evaluator.table_file`
+and only build them in memory if that file is missing or invalid. Importing
+never writes the file, build it once with:
+    python -m engine.evaluator.table_file
+
+A mapped :class:`LookupTable` reads the file in place, so every process shares
+one copy of its pages: the dense flush and rank class tables are indexed
+directly, and prime products are binary searched in their sorted section by
+:class:`SortedLookup` instead of being copied into per-process dicts.
 """
 
-from typing import Dict
+from bisect import bisect_left
+from typing import Iterator, List, Mapping, Optional, Sequence
 import itertools
+import warnings
 
 from engine.card import card
 from engine.card.card import Card
+from engine.evaluator import table_file
+from engine.evaluator.table_file import TableArrays
+
+
+class SortedLookup(Mapping[int, int]):
+    """
+    A read-only mapping over two parallel sequences, keys sorted ascending, that
+    finds a key by binary search. Backed by the sections of a mapped table file,
+    it answers the same lookups as a dict without copying them.
+    """
+
+    def __init__(self, keys: Sequence[int], values: Sequence[int]):
+        """
+        Arguments:
+            keys (Sequence[int]): The sorted keys
+            values (Sequence[int]): The value of each key
+        """
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: int) -> int:
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
 
 
 class LookupTable:
@@ -67,19 +116,47 @@ class LookupTable:
         9: "High card",
     }
 
-    def __init__(self):
+    def __init__(self, tables: Optional[TableArrays] = None):
         """
-        Calculates lookup tables
+        Calculates lookup tables, or reads them in place from tables if given.
+
+        Arguments:
+            tables (TableArrays, optional): Tables loaded with
+                :func:`engine.evaluator.table_file.load_tables`
         """
+        self.tables = tables
+
+        if tables is not None:
+            self.flush_lookup: Mapping[int, int] = SortedLookup(
+                tables.flush_products, tables.flush_ranks
+            )
+            self.unsuited_lookup: Mapping[int, int] = SortedLookup(
+                tables.unsuited_products, tables.unsuited_ranks
+            )
+            self.flush_rankbits_lookup: Sequence[int] = tables.flush_rankbits
+            self.rank_class_lookup: Sequence[int] = tables.rank_classes
+            return
+
         # create dictionaries
-        self.flush_lookup: Dict[int, int] = {}
-        self.unsuited_lookup: Dict[int, int] = {}
+        self.flush_lookup = {}
+        self.unsuited_lookup = {}
+
+        # dense flush table indexed directly by the 13 bit rank mask
+        self.flush_rankbits_lookup = [0] * (1 << len(Card.INT_RANKS))
+
+        # rank class of every rank, index 0 is unused
+        self.rank_class_lookup = [0] * (LookupTable.MAX_HIGH_CARD + 1)
+        self._rank_classes()
 
         # create the lookup table in piecewise fashion
         self._flushes()  # this will call straights and high card method,
         # we reuse some of the bit sequences
         self._multiples()
 
+        # extend both tables to 6 and 7 card hands
+        self._seven_card_flushes()
+        self._seven_card_multisets()
+
     def _flushes(self):
         """
         Straight flushes and flushes.
@@ -259,6 +336,75 @@ class LookupTable:
                 self.unsuited_lookup[product] = rank
                 rank += 1
 
+    def flush_rank(self, rankbits: int) -> int:
+        """
+        Arguments:
+            rankbits (int): The 13 bit rank mask of 5, 6 or 7 cards of one suit
+        Returns:
+            int: The rank of the best 5 card flush
+        """
+        return self.flush_rankbits_lookup[rankbits]
+
+    def unsuited_rank(self, cards: List[Card]) -> int:
+        """
+        Arguments:
+            cards (list[Card]): 5, 6 or 7 cards
+        Returns:
+            int: The rank of the best 5 cards, assuming they make no flush
+        """
+        return self.unsuited_lookup[card.prime_product_from_hand(cards)]
+
+    def _rank_classes(self):
+        """
+        Rank classes, so finding the class of a rank is a single list index.
+        """
+        rank = 1
+        for max_rank, rank_class in sorted(LookupTable.MAX_TO_RANK_CLASS.items()):
+            while rank <= max_rank:
+                self.rank_class_lookup[rank] = rank_class
+                rank += 1
+
+    def _seven_card_flushes(self):
+        """
+        Flushes with 5, 6 or 7 cards of one suit, indexed by their rank mask.
+        A mask with more than 5 bits gets the best rank among the masks
+        with one bit removed, which are smaller and so already filled in.
+        """
+        for rankbits in range(len(self.flush_rankbits_lookup)):
+            num_cards = bin(rankbits).count("1")
+            if num_cards == 5:
+                prime_product = card.prime_product_from_rankbits(rankbits)
+                self.flush_rankbits_lookup[rankbits] = self.flush_lookup[prime_product]
+            elif num_cards in (6, 7):
+                self.flush_rankbits_lookup[rankbits] = min(
+                    self.flush_rankbits_lookup[rankbits & ~(1 << i)]
+                    for i in Card.INT_RANKS
+                    if rankbits & (1 << i)
+                )
+
+    def _seven_card_multisets(self):
+        """
+        Unsuited 6 and 7 card hands. Every multiset of ranks (at most four of
+        a rank) gets the best rank among the multisets with one card removed.
+        Removing a card is dividing the prime product by the card's prime.
+        """
+        for num_cards in (6, 7):
+            for ranks in itertools.combinations_with_replacement(
+                Card.INT_RANKS, num_cards
+            ):
+                # ranks are sorted, so five of a kind spans 5 positions
+                if any(ranks[i] == ranks[i + 4] for i in range(num_cards - 4)):
+                    continue
+
+                product = 1
+                for rank in ranks:
+                    product *= Card.PRIMES[rank]
+
+                self.unsuited_lookup[product] = min(
+                    self.unsuited_lookup[product // Card.PRIMES[rank]]
+                    for rank in set(ranks)
+                )
+
     @staticmethod
     def _get_lexographically_next_bit_sequence(bits):
         """
@@ -278,4 +424,22 @@ class LookupTable:
             yield lexo_next
 
 
-LOOKUP_TABLE = LookupTable()
+def load_lookup_table(path=table_file.DEFAULT_PATH) -> LookupTable:
+    """
+    Arguments:
+        path (Union[str, os.PathLike]): The table file to map, defaults to
+            lookup_table.bin next to this package.
+    Returns:
+        LookupTable: The table read from path, or built in memory if path is
+            missing or fails validation.
+    """
+    try:
+        return LookupTable(table_file.load_tables(path))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as err:
+        warnings.warn(f"Rebuilding lookup tables: {err}")
+    return LookupTable()
+
+
+LOOKUP_TABLE = load_lookup_table()
@@ -0,0 +1,163 @@
+"""
+The memo module keeps the results of :func:`engine.evaluator.evaluator.evaluate`
+for hole cards and boards that come up again, i.e. the same hand scored by the
+game, the agents, the env observation and the GUI.
+
+A rank only depends on the set of cards, so results are keyed by a 52 bit mask
+of the hole cards and board together. The cache is a bounded least recently
+used dict with hit, miss and eviction counters, so a workload can check whether
+it pays off. Disabled, it calls straight through to evaluate.
+
+The shared cache is opt-in. Freshly dealt hands almost never repeat, so for
+plain game play it only adds lookups and memory, and the game calls evaluate
+directly. Enable it for workloads that score the same cards again.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, List
+
+from engine.card.card import Card
+from engine.card.combos import CARD_INDEX
+from engine.evaluator.evaluator import evaluate
+
+DEFAULT_MAX_SIZE = 1 << 18
+
+_CARD_BITS = {card: 1 << index for card, index in CARD_INDEX.items()}
+
+
+class EvaluationCache:
+    """
+    A least recently used cache of :func:`engine.evaluator.evaluator.evaluate`.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, enabled: bool = True):
+        """
+        Arguments:
+            max_size (int): The most results to keep, defaults to 262,144
+            enabled (bool): Whether to cache at all, defaults to True. Can be
+                switched later through the enabled attribute.
+        Raises:
+            ValueError: If max_size is less than 1
+        """
+        if max_size < 1:
+            raise ValueError(f"Expected a max_size of at least 1, got {max_size}")
+
+        self.max_size = max_size
+        self.enabled = enabled
+        self._ranks: OrderedDict[int, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def evaluate(self, cards: List[Card], board: List[Card]) -> int:
+        """
+        Arguments:
+            cards (list[Card]): The two hole cards
+            board (list[Card]): The 0, 3, 4 or 5 board cards
+        Returns:
+            int: The rank :func:`engine.evaluator.evaluator.evaluate` gives
+        """
+        if not self.enabled:
+            return evaluate(cards, board)
+
+        key = 0
+        for card in cards:
+            key |= _CARD_BITS[card]
+        for card in board:
+            key |= _CARD_BITS[card]
+
+        rank = self._ranks.get(key)
+        if rank is not None:
+            self.hits += 1
+            self._ranks.move_to_end(key)
+            return rank
+
+        self.misses += 1
+        rank = evaluate(cards, board)
+        self._ranks[key] = rank
+        if len(self._ranks) > self.max_size:
+            self._ranks.popitem(last=False)
+            self.evictions += 1
+        return rank
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns:
+            float: The share of lookups answered from the cache, 0 before any
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            dict[str, float]: The counters, current size and hit rate
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        """
+        Drops every result and resets the counters.
+        """
+        self._ranks.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def __repr__(self) -> str:
+        return (
+            f"EvaluationCache({len(self)}/{self.max_size}, enabled={self.enabled}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+
+EVALUATION_CACHE = EvaluationCache(enabled=False)
+"""The shared cache, off by default, enable with ``EVALUATION_CACHE.enabled = True``"""
+
+
+def cached_evaluate(cards: List[Card], board: List[Card]) -> int:
+    """
+    :func:`engine.evaluator.evaluator.evaluate` through the shared cache.
+
+    Arguments:
+        cards (list[Card]): The two hole cards
+        board (list[Card]): The 0, 3, 4 or 5 board cards
+    Returns:
+        int: A number between 1 (highest) and 7462 (lowest) representing the
+            relative hand rank of the given cards
+    """
+    return EVALUATION_CACHE.evaluate(cards, board)
+
+
+if __name__ == "__main__":
+    # --- cached and uncached evaluate on a workload with repeats --- #
+    import random
+    import timeit
+
+    from engine.card.combos import CARDS
+
+    rng = random.Random(0)
+    distinct = [rng.sample(CARDS, 7) for _ in range(10_000)]
+    workload = [rng.choice(distinct) for _ in range(100_000)]
+
+    for enabled in (False, True):
+        EVALUATION_CACHE.clear()
+        EVALUATION_CACHE.enabled = enabled
+        seconds = timeit.timeit(
+            lambda: [cached_evaluate(cards[:2], cards[2:]) for cards in workload],
+            number=1,
+        )
+        print(
+            f"enabled={enabled}: {len(workload) / seconds:,.0f} evaluations/s, "
+            f"{EVALUATION_CACHE.stats()}"
+        )
@@ -0,0 +1,181 @@
+"""
+The preflop table module serves all-in preflop equities of the 169 starting
+hand classes against 1-9 random opponents from a generated float32 table, so
+the equity of any hole cards is one array index.
+
+Starting hand classes are laid out on the usual 13x13 grid, high rank a and
+low rank b (ranks 0-12):
+    - pairs:   a * 13 + a
+    - suited:  a * 13 + b
+    - offsuit: b * 13 + a
+
+The table is generated by Monte Carlo with a fixed seed and is reproduced with:
+    python -m engine.evaluator.preflop_table [samples] [seed]
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple, Union
+import os
+import sys
+
+import numpy as np
+
+from engine.card.card import Card
+
+PREFLOP_EQUITY_PATH = Path(__file__).with_name("preflop_equity.npy")
+
+NUM_CLASSES = 169
+MAX_OPPONENTS = 9
+
+DEFAULT_SAMPLES = 200_000
+DEFAULT_SEED = 7462
+
+
+def starting_hand_class(cards: List[Card]) -> int:
+    """
+    Arguments:
+        cards (list[Card]): Two hole cards
+    Returns:
+        int: The starting hand class of the cards in [0, 169)
+    """
+    high, low = cards[0].rank, cards[1].rank
+    if high < low:
+        high, low = low, high
+    if cards[0].suit == cards[1].suit:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def starting_hand_classes(hands: np.ndarray) -> np.ndarray:
+    """
+    Vectorized :func:`starting_hand_class`.
+
+    Arguments:
+        hands (np.ndarray): An [N, 2] integer array of card ints
+    Returns:
+        np.ndarray: The [N] starting hand classes
+    """
+    ranks = (hands >> 8) & 0xF
+    high, low = ranks.max(axis=1), ranks.min(axis=1)
+    suited = (hands[:, 0] & hands[:, 1] & 0xF000) != 0
+    return np.where(suited, high * 13 + low, low * 13 + high)
+
+
+def class_combos(hand_class: int) -> int:
+    """
+    Returns:
+        int: How many of the 1326 hole card combos are in the given class
+    """
+    high, low = divmod(hand_class, 13)
+    if high == low:
+        return 6
+    return 4 if high > low else 12
+
+
+def load_preflop_table(
+    path: Union[str, os.PathLike] = PREFLOP_EQUITY_PATH
+) -> np.ndarray:
+    """
+    Arguments:
+        path (Union[str, os.PathLike]): The table to load
+    Returns:
+        np.ndarray: A read-only [169, 9] float32 array, the equity of every class
+            against 1-9 opponents
+    Raises:
+        OSError: If the table does not exist, see the module docstring to build it
+        ValueError: If the table has the wrong shape or type
+    """
+    table = np.load(path, mmap_mode="r")
+    if table.shape != (NUM_CLASSES, MAX_OPPONENTS) or table.dtype != np.float32:
+        raise ValueError(f"Invalid preflop table {path}: {table.shape} {table.dtype}")
+    return table
+
+
+@lru_cache(maxsize=None)
+def preflop_tables() -> Tuple[np.ndarray, List[float]]:
+    """
+    Loads the table on first use, so it can be generated with the evaluator.
+
+    Returns:
+        Tuple[np.ndarray, list[float]]: The [169, 9] equity table and, for every
+            class, the fraction of the 1326 hole card combos with a lower heads-up
+            equity.
+    """
+    table = load_preflop_table()
+    heads_up = table[:, 0].tolist()
+    combos = [class_combos(hand_class) for hand_class in range(NUM_CLASSES)]
+    percentiles = [
+        sum(n for other, n in zip(heads_up, combos) if other < equity) / 1326
+        for equity in heads_up
+    ]
+    return table, percentiles
+
+
+def preflop_equity(cards: List[Card], num_opponents: int = 1) -> float:
+    """
+    Arguments:
+        cards (list[Card]): Two hole cards
+        num_opponents (int): How many random hands are all-in against them (1-9)
+    Returns:
+        float: The all-in equity of the cards before the flop
+    """
+    return float(preflop_tables()[0][starting_hand_class(cards), num_opponents - 1])
+
+
+def preflop_percentile(cards: List[Card]) -> float:
+    """
+    Arguments:
+        cards (list[Card]): Two hole cards
+    Returns:
+        float: The fraction of hole card combos with a lower heads-up equity
+    """
+    return preflop_tables()[1][starting_hand_class(cards)]
+
+
+def generate_preflop_table(
+    samples: int = DEFAULT_SAMPLES, seed: int = DEFAULT_SEED
+) -> np.ndarray:
+    """
+    Arguments:
+        samples (int): Runouts sampled per class and opponent count
+        seed (int): Base seed, every entry is seeded from it and its position
+    Returns:
+        np.ndarray: A [169, 9] float32 equity table
+    """
+    # pylint: disable=import-outside-toplevel
+    from engine.equity.monte_carlo import estimate_equity
+
+    table = np.zeros((NUM_CLASSES, MAX_OPPONENTS), dtype=np.float32)
+    for hand_class in range(NUM_CLASSES):
+        high, low = divmod(hand_class, 13)
+        if high >= low:  # pairs and suited
+            second_suit = "h" if high == low else "s"
+            cards = [
+                Card(Card.STR_RANKS[high] + "s"),
+                Card(Card.STR_RANKS[low] + second_suit),
+            ]
+        else:
+            cards = [
+                Card(Card.STR_RANKS[low] + "s"),
+                Card(Card.STR_RANKS[high] + "h"),
+            ]
+
+        for num_opponents in range(1, MAX_OPPONENTS + 1):
+            table[hand_class, num_opponents - 1] = estimate_equity(
+                cards,
+                num_opponents=num_opponents,
+                margin=0,
+                max_samples=samples,
+                seed=seed * 10_000 + hand_class * 10 + num_opponents,
+            ).equity
+    return table
+
+
+if __name__ == "__main__":
+    num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLES
+    base_seed = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SEED
+    np.save(PREFLOP_EQUITY_PATH, generate_preflop_table(num_samples, base_seed))
+    print(f"wrote {PREFLOP_EQUITY_PATH}")
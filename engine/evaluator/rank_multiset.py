@@ -0,0 +1,76 @@
+"""
+The rank multiset module holds the minimal perfect hash that indexes the
+unsuited tables of :mod:`engine.evaluator.array_lookup_table`,
+:mod:`engine.evaluator.batch` and the table file.
+
+The hash is the combinatorial number system for multisets. A sorted hand
+r_0 <= r_1 <= ... <= r_(n-1) maps to the strictly increasing r_k + k, and its
+index is the sum of C(r_k + k, k + 1). This enumerates every multiset of n ranks
+exactly once in [0, C(12 + n, n)), so each hand size gets a block of the array
+starting at :data:`MULTISET_OFFSETS` [n]. The few slots of impossible hands
+(five of a kind) are left at 0.
+
+It only depends on the cards, so the table file module can use it without
+importing the lookup table module.
+"""
+
+from __future__ import annotations
+
+from array import array
+from math import comb
+from operator import getitem
+from typing import TYPE_CHECKING, Iterable, List
+import itertools
+
+from engine.card.card import Card
+
+if TYPE_CHECKING:
+    from engine.evaluator.lookup_table import LookupTable
+
+MULTISET_SIZES = (5, 6, 7)
+
+POSITION_KEYS: List[List[int]] = [
+    [comb(rank + position, position + 1) for rank in Card.INT_RANKS]
+    for position in range(max(MULTISET_SIZES))
+]
+"""POSITION_KEYS[k][r]: the contribution of rank r as the kth smallest rank"""
+
+MULTISET_OFFSETS = {}
+_offset = 0
+for _size in MULTISET_SIZES:
+    MULTISET_OFFSETS[_size] = _offset
+    _offset += comb(len(Card.INT_RANKS) - 1 + _size, _size)
+NUM_MULTISETS = _offset
+"""Total size of the unsuited array over all hand sizes"""
+
+
+def rank_multiset_index(ranks: Iterable[int]) -> int:
+    """
+    Arguments:
+        ranks (Iterable[int]): The 5, 6 or 7 card ranks (0-12) of a hand, any order
+    Returns:
+        int: The index of the hand's rank multiset in the unsuited array
+    """
+    ranks = sorted(ranks)
+    return MULTISET_OFFSETS[len(ranks)] + sum(map(getitem, POSITION_KEYS, ranks))
+
+
+def unsuited_multiset_ranks(table: LookupTable) -> array:
+    """
+    Arguments:
+        table (LookupTable): The prime product keyed table to convert
+    Returns:
+        array: The unsuited ranks of the given table, indexed by
+            :func:`rank_multiset_index`
+    """
+    ranks = array("H", bytes(2 * NUM_MULTISETS))
+    for size in MULTISET_SIZES:
+        for multiset in itertools.combinations_with_replacement(Card.INT_RANKS, size):
+            product = 1
+            for rank in multiset:
+                product *= Card.PRIMES[rank]
+
+            # five of a kind is not in the table
+            if product in table.unsuited_lookup:
+                ranks[rank_multiset_index(multiset)] = table.unsuited_lookup[product]
+    return ranks
@@ -0,0 +1,202 @@
+"""
+The table file module saves the lookup tables to a compact binary file and
+memory-maps them back read-only, so importing the evaluator does not rebuild
+the tables. Every lookup, scalar or array, reads the mapped pages in place, so
+every process shares one copy of them.
+
+Build the file once with:
+    python -m engine.evaluator.table_file [path]
+
+Layout (little-endian, every section 8 byte aligned):
+
+.. table::
+    :align: center
+    :widths: auto
+
+    ==================  ==========  =================================
+    Section             Type        Contents
+    ==================  ==========  =================================
+    header              32 bytes    magic, section lengths, crc32
+    flush_products      int64[F]    sorted 5 card flush prime products
+    unsuited_products   int64[U]    sorted unsuited prime products
+    flush_ranks         uint16[F]   rank of each flush product
+    unsuited_ranks      uint16[U]   rank of each unsuited product
+    flush_rankbits      uint16[M]   rank of each 13 bit flush mask
+    unsuited_multisets  uint16[S]   rank of each rank multiset index
+    rank_classes        uint8[R]    rank class of each rank
+    ==================  ==========  =================================
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Union
+from pathlib import Path
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from engine.evaluator.rank_multiset import unsuited_multiset_ranks
+
+if TYPE_CHECKING:
+    from engine.evaluator.lookup_table import LookupTable
+
+MAGIC = b"PKRLUT03"
+"""Bump the trailing version whenever the layout or table contents change."""
+
+HEADER = struct.Struct("<8sIIIIII")
+"""magic, section lengths (flush, unsuited, rankbits, multisets, classes), crc32"""
+
+DEFAULT_PATH = Path(__file__).with_name("lookup_table.bin")
+
+_SECTIONS = (
+    ("flush_products", "q", 0),
+    ("unsuited_products", "q", 1),
+    ("flush_ranks", "H", 0),
+    ("unsuited_ranks", "H", 1),
+    ("flush_rankbits", "H", 2),
+    ("unsuited_multisets", "H", 3),
+    ("rank_classes", "B", 4),
+)
+"""(name, memoryview format, index of the section length in the header)"""
+
+
+@dataclass(frozen=True)
+class TableArrays:
+    """Read-only typed views into a memory-mapped table file."""
+
+    flush_products: memoryview
+    unsuited_products: memoryview
+    flush_ranks: memoryview
+    unsuited_ranks: memoryview
+    flush_rankbits: memoryview
+    unsuited_multisets: memoryview
+    rank_classes: memoryview
+
+
+def _padded(num_bytes: int) -> int:
+    return (num_bytes + 7) & ~7
+
+
+def save_tables(
+    table: LookupTable, path: Union[str, os.PathLike] = DEFAULT_PATH
+) -> os.PathLike:
+    """
+    Serializes the given lookup table. The file is written next to its
+    destination and moved into place, so readers never see a partial file.
+
+    Arguments:
+        table (LookupTable): The table to save
+        path (Union[str, os.PathLike]): Where to save the table, defaults to
+            lookup_table.bin next to this module.
+    Returns:
+        os.PathLike: The path of the table file
+    """
+    multisets = unsuited_multiset_ranks(table)
+
+    # products are sorted so they can be binary searched in place
+    flushes = sorted(table.flush_lookup.items())
+    unsuited = sorted(table.unsuited_lookup.items())
+    columns = {
+        "flush_products": [product for product, _ in flushes],
+        "flush_ranks": [rank for _, rank in flushes],
+        "unsuited_products": [product for product, _ in unsuited],
+        "unsuited_ranks": [rank for _, rank in unsuited],
+        "flush_rankbits": table.flush_rankbits_lookup,
+        "unsuited_multisets": multisets,
+        "rank_classes": table.rank_class_lookup,
+    }
+
+    payload = bytearray()
+    for name, fmt, _ in _SECTIONS:
+        data = struct.pack(f"<{len(columns[name])}{fmt}", *columns[name])
+        payload += data + bytes(_padded(len(data)) - len(data))
+
+    header = HEADER.pack(
+        MAGIC,
+        len(table.flush_lookup),
+        len(table.unsuited_lookup),
+        len(table.flush_rankbits_lookup),
+        len(multisets),
+        len(table.rank_class_lookup),
+        zlib.crc32(payload),
+    )
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(header + payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_tables(path: Union[str, os.PathLike] = DEFAULT_PATH) -> TableArrays:
+    """
+    Memory-maps the given table file read-only and validates its checksum.
+
+    Arguments:
+        path (Union[str, os.PathLike]): The table file, defaults to
+            lookup_table.bin next to this module.
+    Returns:
+        TableArrays: Zero-copy views into the mapped file
+    Raises:
+        OSError: If the file cannot be opened
+        ValueError: If the file is not a valid table file for this version
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Table files can only be mapped on little-endian machines")
+
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError(f"Table file {path} is truncated")
+
+    magic, *lengths, checksum = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f"Table file {path} has the wrong magic {magic!r}")
+
+    payload = view[HEADER.size :]
+    if zlib.crc32(payload) != checksum:
+        raise ValueError(f"Table file {path} failed its checksum")
+
+    sections = {}
+    offset = 0
+    for name, fmt, length_index in _SECTIONS:
+        num_bytes = lengths[length_index] * struct.calcsize(fmt)
+        if offset + num_bytes > len(payload):
+            raise ValueError(f"Table file {path} is truncated")
+        sections[name] = payload[offset : offset + num_bytes].cast(fmt)
+        offset += _padded(num_bytes)
+
+    return TableArrays(**sections)
+
+
+if __name__ == "__main__":
+    # pylint: disable=ungrouped-imports
+    import time
+
+    from engine.evaluator.lookup_table import LookupTable as _LookupTable
+
+    out_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PATH
+
+    start_time = time.perf_counter()
+    built = _LookupTable()
+    build_time = time.perf_counter() - start_time
+    save_tables(built, out_path)
+
+    start_time = time.perf_counter()
+    loaded = _LookupTable(load_tables(out_path))
+    load_time = time.perf_counter() - start_time
+
+    assert loaded.flush_lookup == built.flush_lookup
+    assert loaded.unsuited_lookup == built.unsuited_lookup
+    assert list(loaded.flush_rankbits_lookup) == built.flush_rankbits_lookup
+    assert list(loaded.rank_class_lookup) == built.rank_class_lookup
+    print(
+        f"wrote {out_path} ({out_path.stat().st_size:,} bytes), "
+        f"build {build_time * 1000:.1f}ms, load {load_time * 1000:.1f}ms"
+    )
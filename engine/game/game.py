@@ -13,13 +13,15 @@ It also includes the main TexasHoldEm class of the texasholdem package.
 
 from __future__ import annotations
 
+import copy
 import os
-from typing import Iterator, Callable, Dict, Tuple, Optional, Union, List
+from typing import Iterator, Callable, Dict, Tuple, Optional, Union, List, NamedTuple
 from enum import Enum, auto
+from itertools import compress
 import random
 
 from engine.card.card import Card
-from engine.card.deck import Deck
+from engine.card.deck import Deck, DeckSnapshot
 from engine.game.history import (
     History,
     PrehandHistory,
@@ -31,7 +33,70 @@ from engine.game.history import (
 from engine.game.action_type import ActionType
 from engine.game.hand_phase import HandPhase
 from engine.game.player_state import PlayerState
-from engine.evaluator import evaluator
+from engine.evaluator.evaluator import evaluate
+from engine.evaluator.incremental import EvaluatorSnapshot, IncrementalEvaluator
+
+
+class Move(NamedTuple):
+    """
+    An action resolved against the game state: ALL_IN translated to a call or
+    a raise, with the chips it posts.
+
+    It is the unit that crosses the API boundary on the trusted path:
+    :meth:`TexasHoldEm.check_move` validates an action once and returns its
+    Move, and :meth:`TexasHoldEm.take_validated_action` executes that Move as
+    is, without resolving or validating it again.
+    """
+
+    action_type: ActionType
+    value: Optional[int]
+    amount: int
+    """Chips the player posts, 0 for checks and folds"""
+
+
+ACTION_TYPES = tuple(ActionType)
+"""The order of :attr:`LegalActions.mask`"""
+
+_ACTION_INDEX = {action_type: i for i, action_type in enumerate(ACTION_TYPES)}
+
+
+class LegalActions(NamedTuple):
+    """
+    The moves a player can make, as given by :meth:`TexasHoldEm.legal_actions`.
+    Raise values are the player's total bet this round, as for
+    :meth:`TexasHoldEm.take_action`.
+    """
+
+    player_id: int
+    actions: Tuple[ActionType, ...]
+    """The legal action types, in ActionType order"""
+    chips_to_call: int
+    """Chips the player needs to call in all pots"""
+    bet_amount: int
+    """Chips the player has bet this round"""
+    min_raise: Optional[int]
+    """The smallest legal raise value, None if the player cannot raise"""
+    max_raise: Optional[int]
+    """The largest legal raise value (all in), None if the player cannot raise"""
+    mask: Tuple[bool, ...]
+    """Whether each action type of :data:`ACTION_TYPES` is legal"""
+
+    def is_legal(self, action_type: ActionType, value: Optional[int] = None) -> bool:
+        """
+        Arguments:
+            action_type (ActionType): The ActionType to take
+            value (int, optional): In the case of raise, how much to raise
+        Returns:
+            bool: True if the move is valid, as :meth:`TexasHoldEm.validate_move`
+                would say
+        """
+        if action_type == ActionType.RAISE:
+            return (
+                self.min_raise is not None
+                and value is not None
+                and self.min_raise <= value <= self.max_raise
+            )
+        return self.mask[_ACTION_INDEX[action_type]]
 
 
 class Player:
@@ -204,6 +269,60 @@ class GameState(Enum):
     of chips and unable to play hands."""
 
 
+PotSnapshot = Tuple[int, int, Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]
+"""The amount, raised level, player amounts and player amounts without removes"""
+
+RoundSnapshot = Tuple[Tuple[Card, ...], Tuple[PlayerAction, ...]]
+"""The new cards and actions of a betting round history"""
+
+
+class GameSnapshot(NamedTuple):
+    """
+    The state of a :class:`TexasHoldEm` between actions, as given by
+    :meth:`TexasHoldEm.snapshot`. Mutable state is copied into tuples, cards,
+    moves and finished history entries are shared as they are never changed.
+    """
+
+    hand_phase: HandPhase
+    game_state: GameState
+    num_hands: int
+    game_restarts: int
+    btn_loc: int
+    sb_loc: int
+    bb_loc: int
+    current_player: int
+    starting_pot: int
+    players: Tuple[Tuple[int, PlayerState, int], ...]
+    """The chips, state and last_pot of every player"""
+    buyin_history: Tuple[int, ...]
+    total_buyin_history: Tuple[int, ...]
+    pots: Tuple[PotSnapshot, ...]
+    bet_totals: Tuple[int, ...]
+    call_totals: Tuple[int, ...]
+    stake_totals: Tuple[int, ...]
+    hands: Tuple[Tuple[int, Tuple[Card, ...]], ...]
+    board: Tuple[Card, ...]
+    community_cards: Tuple[Card, ...]
+    deck: Optional[DeckSnapshot]
+    hand_evaluators: Tuple[Tuple[int, EvaluatorSnapshot], ...]
+    hand_scores: Optional[Tuple[Tuple[int, int], ...]]
+    """None until evaluated with lazy_hand_scores"""
+    history: Optional[
+        Tuple[
+            PrehandHistory,
+            Optional[RoundSnapshot],
+            Optional[RoundSnapshot],
+            Optional[RoundSnapshot],
+            Optional[RoundSnapshot],
+            Optional[SettleHistory],
+        ]
+    ]
+    """The prehand, preflop, flop, turn, river and settle history"""
+    action: Optional[Move]
+    betting_round: Tuple[int, int, int]
+    """The first pot, the start and the position of the betting order"""
+
+
 class TexasHoldEm:
     # pylint: disable=too-many-instance-attributes,stop-iteration-return
 
@@ -231,6 +350,8 @@ class TexasHoldEm:
         max_players=9,
         add_chips_when_lose=False,
         num_to_action=None,
+        lazy_hand_scores=False,
+        debug=False,
     ):
         """
         Arguments:
@@ -238,6 +359,14 @@ class TexasHoldEm:
             big_blind (int): Big blind
             small_blind (int): Small blind
             max_players (int): how many players can sit at the table, defaults to 9.
+            lazy_hand_scores (bool): Evaluate :attr:`player_hand_scores` on first
+                access instead of at PREHAND, defaults to False. Showdowns then
+                only rank the players still in a pot, so hands that end in folds
+                evaluate nothing.
+            debug (bool): Check the running bet totals behind
+                :meth:`chips_to_call`, :meth:`player_bet_amount` and
+                :meth:`chips_at_stake` against the pots on every query,
+                defaults to False.
         """
         self.buyin = buyin
         self.big_blind = big_blind
@@ -249,6 +378,8 @@ class TexasHoldEm:
         self.num_to_action = num_to_action
 
         self.add_chips_when_lose = add_chips_when_lose
+        self.lazy_hand_scores = lazy_hand_scores
+        self.debug = debug
 
         self.players: list[Player] = list(
             Player(i, self.buyin) for i in range(max_players)
@@ -267,18 +398,42 @@ class TexasHoldEm:
 
         self.pots = []
         self.starting_pot = 0
+
+        # running totals over the pots by player_id, see _sync_bet_totals()
+        self._bet_totals = [0] * max_players
+        self._call_totals = [0] * max_players
+        self._stake_totals = [0] * max_players
         self._deck = None
         self.board = []
+        self.community_cards: List[Card] = []
         self.hands = {}
-        self.player_hand_scores = {}
+        self.hand_evaluators: dict[int, IncrementalEvaluator] = {}
+        self._player_hand_scores: Optional[dict[int, int]] = {}
 
         self.num_hands = 0
         self.hand_phase = HandPhase.PREHAND
         self.game_state = GameState.RUNNING
 
-        self._handstate_handler: Dict[
-            HandPhase, Callable[[], Optional[Iterator[TexasHoldEm]]]
-        ] = {
+        self._handstate_handler = self._new_handstate_handler()
+
+        self.hand_history: Optional[History] = None
+        self._action: Optional[Move] = None
+        self._hand_gen = None
+
+        # progress of the betting round, see _next_to_act()
+        self._round_first_pot = 0
+        self._round_start = 0
+        self._round_position = 0
+
+    def _new_handstate_handler(
+        self,
+    ) -> Dict[HandPhase, Callable[[], Optional[Iterator[TexasHoldEm]]]]:
+        """
+        Returns:
+            dict[HandPhase, Callable]: The handler of every hand phase, bound to
+                this game
+        """
+        return {
             HandPhase.PREHAND: self._prehand,
             HandPhase.PREFLOP: lambda: self._betting_round(HandPhase.PREFLOP),
             HandPhase.FLOP: lambda: self._betting_round(HandPhase.FLOP),
@@ -287,10 +442,6 @@ class TexasHoldEm:
             HandPhase.SETTLE: self._settle,
         }
 
-        self.hand_history: Optional[History] = None
-        self._action = None, None
-        self._hand_gen = None
-
     def _prehand(self):
         """
         Handles skips, not enough chips, rotation and posting of blinds,
@@ -345,6 +496,7 @@ class TexasHoldEm:
         self.pots[0].player_amounts_without_remove = {
             i: 0 for i in range(self.max_players)
         }
+        self._sync_bet_totals()
 
         # deal cards
         self._deck = Deck()
@@ -356,18 +508,19 @@ class TexasHoldEm:
         for player_id in self.active_iter(self.btn_loc + 1):
             self.hands[player_id] = self._deck.draw(num=2)
 
-        # evaluate every player's hands
-        self.player_hand_scores = {}
-        for player in self.players:
-            if player.state in (PlayerState.OUT, PlayerState.SKIP):
-                continue
-            active_player_hand = self.hands[player.player_id]
-            self.player_hand_scores[player.player_id] = evaluator.evaluate(
-                active_player_hand, self.community_cards
-            )
+        # each player's strength on the board so far, updated as cards come out
+        self.hand_evaluators = {
+            player_id: IncrementalEvaluator(hand)
+            for player_id, hand in self.hands.items()
+        }
+
+        # evaluate every player's hands, or on first access
+        self._player_hand_scores = None
+        if not self.lazy_hand_scores:
+            self._player_hand_scores = self._evaluate_hand_scores()
 
         # reset history
-        self._action = None, None
+        self._action = None
         self.hand_history = History(
             prehand=PrehandHistory(
                 btn_loc=self.btn_loc,
@@ -448,6 +601,55 @@ class TexasHoldEm:
             if self.players[player_id].state in (PlayerState.IN, PlayerState.TO_CALL):
                 yield player_id
 
+    def _evaluate_hand_scores(self) -> dict[int, int]:
+        """
+        Returns:
+            dict[int, int]: The rank of every player dealt in at PREHAND, folded
+                or not, on the community cards of this hand
+        """
+        return {
+            player_id: evaluate(hand, self.community_cards)
+            for player_id, hand in sorted(self.hands.items())
+        }
+
+    @property
+    def player_hand_scores(self) -> dict[int, int]:
+        """
+        Returns:
+            dict[int, int]: The rank of every dealt player's hand on the
+                community cards of this hand, evaluated on first access when
+                lazy_hand_scores is set
+        """
+        if self._player_hand_scores is None:
+            self._player_hand_scores = self._evaluate_hand_scores()
+        return self._player_hand_scores
+
+    @player_hand_scores.setter
+    def player_hand_scores(self, player_hand_scores: dict[int, int]):
+        self._player_hand_scores = player_hand_scores
+
+    def _add_to_board(self, new_cards: List[Card]):
+        """
+        Adds the given cards to the board and to every dealt player's
+        hand evaluator.
+
+        Arguments:
+            new_cards (list[Card]): The cards to add
+        """
+        self.board.extend(new_cards)
+        for hand_evaluator in self.hand_evaluators.values():
+            hand_evaluator.add_cards(new_cards)
+
+    def get_hand_rank(self, player_id: int) -> int:
+        """
+        Arguments:
+            player_id (int): The player_id of a player dealt into this hand
+        Returns:
+            int: The rank of the player's hand on the board so far, as given by
+                :func:`engine.evaluator.evaluator.evaluate`
+        """
+        return self.hand_evaluators[player_id].rank()
+
     def _split_pot(self, pot_id: int, raised_level: int):
         """
         Splits the given pot at the given raised level, and adds players with
@@ -468,9 +670,88 @@ class TexasHoldEm:
 
         # increment last_pot for players with enough chips
         for player_id in self.in_pot_iter():
-            if self.players[player_id].chips > self.chips_to_call(player_id):
+            if self.players[player_id].chips > self._sum_chips_to_call(player_id):
                 self.players[player_id].last_pot += 1
 
+        # splits are rare, recount instead of tracking the moved chips
+        self._sync_bet_totals()
+
+    def _sync_bet_totals(self):
+        """
+        Recounts every player's running totals from the pots.
+        """
+        for player_id in range(self.max_players):
+            self._bet_totals[player_id] = self._sum_player_bet_amount(player_id)
+            self._call_totals[player_id] = self._sum_chips_to_call(player_id)
+            self._stake_totals[player_id] = self._sum_chips_at_stake(player_id)
+
+    def _pot_post(self, pot_id: int, player_id: int, amount: int):
+        """
+        The given player posts amount into the given pot, updating the running
+        totals.
+
+        Arguments:
+            pot_id (int) - The pot to post into
+            player_id (int) - The player_id of the player posting
+            amount (int) - The amount to post
+        """
+        pot = self.pots[pot_id]
+        raised = pot.raised
+        joined = player_id not in pot.player_amounts
+        pot.player_post(player_id, amount)
+
+        self._bet_totals[player_id] += amount
+        if self.players[player_id].last_pot >= pot_id:
+            self._call_totals[player_id] -= amount
+
+        # a raise adds to the call of everyone eligible for this pot
+        if pot.raised > raised:
+            for player in self.players:
+                if player.last_pot >= pot_id:
+                    self._call_totals[player.player_id] += pot.raised - raised
+
+        for pot_player_id in pot.players_in_pot():
+            self._stake_totals[pot_player_id] += amount
+        if joined:
+            self._stake_totals[player_id] += pot.get_total_amount() - amount
+
+    def _pot_remove_player(self, pot_id: int, player_id: int):
+        """
+        Removes the given player from the given pot, updating the running totals.
+
+        Arguments:
+            pot_id (int) - The pot to leave
+            player_id (int) - The player_id of the player leaving
+        """
+        pot = self.pots[pot_id]
+        if player_id not in pot.player_amounts:
+            return
+
+        amount = pot.get_player_amount(player_id)
+        self._stake_totals[player_id] -= pot.get_total_amount()
+        pot.remove_player(player_id)
+
+        self._bet_totals[player_id] -= amount
+        if self.players[player_id].last_pot >= pot_id:
+            self._call_totals[player_id] += amount
+
+    def _pot_collect_bets(self, pot_id: int):
+        """
+        Collects the bets of the given pot, updating the running totals.
+
+        Arguments:
+            pot_id (int) - The pot to collect
+        """
+        pot = self.pots[pot_id]
+        for player_id, amount in pot.player_amounts.items():
+            self._bet_totals[player_id] -= amount
+        for player in self.players:
+            if player.last_pot >= pot_id:
+                self._call_totals[player.player_id] -= pot.chips_to_call(
+                    player.player_id
+                )
+        pot.collect_bets()
+
     def _player_post(self, player_id: int, amount: int):
         """
         Let a player post the given amount and sets the corresponding board state
@@ -495,9 +776,9 @@ class TexasHoldEm:
         # call in previous pots
         for i in range(last_pot):
             amount = amount - self._get_pot(i).chips_to_call(player_id)
-            self.pots[i].player_post(player_id, self.pots[i].chips_to_call(player_id))
+            self._pot_post(i, player_id, self.pots[i].chips_to_call(player_id))
 
-        self._get_pot(last_pot).player_post(player_id, amount)
+        self._pot_post(last_pot, player_id, amount)
 
         # players previously in pot need to call in event of a raise
         if amount > chips_to_call:
@@ -582,16 +863,23 @@ class TexasHoldEm:
 
         self.current_player = next(self.active_iter(loc=self.btn_loc + 1))
 
+        # a side pot everyone in it folded out of goes to the pot below it
+        pot_amounts = [pot.get_total_amount() for pot in self.pots]
+        for i in range(len(self.pots) - 1, 0, -1):
+            if not self.pots[i].player_amounts:
+                pot_amounts[i - 1] += pot_amounts[i]
+                pot_amounts[i] = 0
+
         for i, pot in enumerate(self.pots, 0):
             players_in_pot = list(pot.players_in_pot())
+            pot_amount = pot_amounts[i]
+            if not players_in_pot:
+                continue
+
             # only player left in pot wins
             if len(players_in_pot) == 1:
-                self.players[players_in_pot[0]].chips += pot.get_total_amount()
-                settle_history.pot_winners[i] = (
-                    pot.get_total_amount(),
-                    -1,
-                    players_in_pot,
-                )
+                self.players[players_in_pot[0]].chips += pot_amount
+                settle_history.pot_winners[i] = (pot_amount, -1, players_in_pot)
                 continue
 
             # make sure there is 5 cards on the board
@@ -600,20 +888,30 @@ class TexasHoldEm:
                     num=5 - len(self.board), draw_from_community=True
                 )
                 settle_history.new_cards.extend(new_cards)
-                self.board.extend(new_cards)
-
-            # use preevaluated hand scores here
-            best_rank = min(self.player_hand_scores.values())
+                self._add_to_board(new_cards)
+
+            # use preevaluated hand scores if there are any
+            if self._player_hand_scores is not None:
+                scores = {
+                    player_id: self._player_hand_scores[player_id]
+                    for player_id in players_in_pot
+                }
+            else:
+                scores = {
+                    player_id: self.get_hand_rank(player_id)
+                    for player_id in players_in_pot
+                }
+            best_rank = min(scores.values())
             winners = [
                 player_id
-                for player_id, player_rank in self.player_hand_scores.items()
+                for player_id, player_rank in scores.items()
                 if player_rank == best_rank
             ]
 
-            settle_history.pot_winners[i] = (pot.get_total_amount(), best_rank, winners)
+            settle_history.pot_winners[i] = (pot_amount, best_rank, winners)
 
-            win_amount = int((pot.get_total_amount()) / len(winners))
-            self.starting_pot += pot.get_total_amount() - (win_amount * len(winners))
+            win_amount = int(pot_amount / len(winners))
+            self.starting_pot += pot_amount - (win_amount * len(winners))
             for player_id in winners:
                 self.players[player_id].chips += win_amount
 
@@ -625,10 +923,9 @@ class TexasHoldEm:
             int: The amount of chips the player needs to call in all pots
                 to play the hand.
         """
-        return sum(
-            self._get_pot(i).chips_to_call(player_id)
-            for i in range(self.players[player_id].last_pot + 1)
-        )
+        if self.debug:
+            self._check_bet_totals(player_id)
+        return self._call_totals[player_id]
 
     def player_bet_amount(self, player_id: int) -> int:
         """
@@ -638,9 +935,9 @@ class TexasHoldEm:
             int: The amount of chips the player bet this round across all
                 pots.
         """
-        return sum(
-            self._get_pot(i).get_player_amount(player_id) for i in range(len(self.pots))
-        )
+        if self.debug:
+            self._check_bet_totals(player_id)
+        return self._bet_totals[player_id]
 
     def chips_at_stake(self, player_id: int) -> int:
         """
@@ -649,121 +946,214 @@ class TexasHoldEm:
         Returns:
             int - The amount of chips the player is eligible to win
         """
+        if self.debug:
+            self._check_bet_totals(player_id)
+        return self._stake_totals[player_id]
+
+    def _sum_chips_to_call(self, player_id: int) -> int:
+        return sum(
+            self._get_pot(i).chips_to_call(player_id)
+            for i in range(self.players[player_id].last_pot + 1)
+        )
+
+    def _sum_player_bet_amount(self, player_id: int) -> int:
+        return sum(
+            self._get_pot(i).get_player_amount(player_id) for i in range(len(self.pots))
+        )
+
+    def _sum_chips_at_stake(self, player_id: int) -> int:
         return sum(
             self._get_pot(i).get_total_amount()
             for i in range(len(self.pots))
             if player_id in self._get_pot(i).players_in_pot()
         )
 
-    def validate_move(
+    def _check_bet_totals(self, player_id: int):
+        """
+        Raises:
+            AssertionError: If the running totals of the player do not match the
+                sums over the pots
+        """
+        totals = (
+            self._call_totals[player_id],
+            self._bet_totals[player_id],
+            self._stake_totals[player_id],
+        )
+        sums = (
+            self._sum_chips_to_call(player_id),
+            self._sum_player_bet_amount(player_id),
+            self._sum_chips_at_stake(player_id),
+        )
+        if totals != sums:
+            raise AssertionError(
+                f"Running totals {totals} of player {player_id} do not match "
+                f"the pots {sums} (chips to call, bet amount, chips at stake)"
+            )
+
+    def _resolve_move(
         self, player_id: int, action: ActionType, value: Optional[int] = None
-    ) -> bool:
+    ) -> Tuple[Move, int, int]:
         """
-        Validate the potentially invalid action for the given player.
+        Translates ALL_IN and works out the chips the move posts, summing the
+        player's bets over the pots once. Does not validate.
 
         Arguments:
             player_id (int): the player to take action
             action (ActionType): The ActionType to take
             value (int, optional): In the case of raise, how much to raise
         Returns:
-            bool: True if the move is valid, False o/w
-
+            tuple[Move, int, int]: The move, the amount the player bet this round
+                and the chips the player needs to call
         """
         if not isinstance(action, ActionType):
             action = self.num_to_action[action]
 
-        # ALL_IN should be translated
-        new_action, new_value = action, value
-        if new_action == ActionType.ALL_IN:
-            new_action, new_value = self._translate_allin(new_action, new_value)
-
         player_amount = self.player_bet_amount(player_id)
         chips_to_call = self.chips_to_call(player_id)
-        raised_level = self._get_pot(self.players[player_id].last_pot).raised
 
+        # ALL_IN should be translated
+        if action == ActionType.ALL_IN:
+            chips = self.players[self.current_player].chips
+            if chips <= chips_to_call:
+                action, value = ActionType.CALL, None
+            else:
+                action, value = ActionType.RAISE, player_amount + chips
+
+        amount = 0
+        if action == ActionType.CALL:
+            amount = chips_to_call
+        elif action == ActionType.RAISE and value is not None:
+            amount = value - player_amount
+        return Move(action, value, amount), player_amount, chips_to_call
+
+    def check_move(
+        self, player_id: int, action: ActionType, value: Optional[int] = None
+    ) -> Optional[Move]:
+        """
+        Resolves and validates the potentially invalid action for the given player,
+        summing the player's bets over the pots once.
+
+        Arguments:
+            player_id (int): the player to take action
+            action (ActionType): The ActionType to take
+            value (int, optional): In the case of raise, how much to raise
+        Returns:
+            Move: The move to pass to :meth:`take_validated_action`, None if the
+                action is invalid
+
+        """
         # Check if player player_id is current player
         if self.current_player != player_id:
-            return False
+            return None
+
+        move, player_amount, chips_to_call = self._resolve_move(
+            player_id, action, value
+        )
+        new_action, new_value = move.action_type, move.value
+        player = self.players[player_id]
 
         if new_action == ActionType.CALL:
-            return self.players[player_id].state == PlayerState.TO_CALL
-        if new_action == ActionType.CHECK:
-            return self.players[player_id].state == PlayerState.IN
-        if new_action == ActionType.RAISE:
-            return not (
+            valid = player.state == PlayerState.TO_CALL
+        elif new_action == ActionType.CHECK:
+            valid = player.state == PlayerState.IN
+        elif new_action == ActionType.RAISE:
+            raised_level = self._get_pot(player.last_pot).raised
+            valid = not (
                 new_value is None
                 or (
                     new_value < raised_level + self.big_blind
-                    and new_value < player_amount + self.players[player_id].chips
+                    and new_value < player_amount + player.chips
                 )
-                or player_amount + self.players[player_id].chips < new_value
+                or player_amount + player.chips < new_value
                 or new_value < chips_to_call
             )
-        if new_action == ActionType.FOLD:
-            return True
+        else:
+            valid = new_action == ActionType.FOLD
 
-        return False
+        return move if valid else None
 
-    def _safe_execute(
-        self, player_id: int, action: ActionType, value: Optional[int] = None
-    ) -> bool:
+    def legal_actions(self, player_id: int) -> LegalActions:
         """
-        Safely execute the potentially Invalid action for the given player.
+        Works out every legal move of the given player at once, so agents can pick
+        one without trying moves against :meth:`validate_move`.
 
         Arguments:
-            player_id (int) 				- the player to take action
-            action (ActionType) 	- The ActionType to take
-            value (Optional[int]) - In the case of raise, how much to raise
+            player_id (int): The player player_id
         Returns:
-            bool - True if successfully executed, False otherwise
+            LegalActions: The legal action types, the chips to call, the raise
+                bounds and a mask over :data:`ACTION_TYPES`. Only the current
+                player has legal actions.
         """
-        # Validate move
-        if not self.validate_move(player_id, action, value):
-            return False
-
-        # ALL_IN should be translated
-        if action == ActionType.ALL_IN:
-            action, value = self._translate_allin(action, value)
-
-        player_amount = self.player_bet_amount(player_id)
+        player = self.players[player_id]
+        bet_amount = self.player_bet_amount(player_id)
         chips_to_call = self.chips_to_call(player_id)
+        if self.current_player != player_id:
+            return LegalActions(
+                player_id,
+                (),
+                chips_to_call,
+                bet_amount,
+                None,
+                None,
+                (False,) * len(ACTION_TYPES),
+            )
 
-        # Execute move
-        if action == ActionType.CALL:
-            self._player_post(player_id, chips_to_call)
-        elif action == ActionType.CHECK:
-            pass
-        elif action == ActionType.RAISE:
-            self._player_post(player_id, value - player_amount)
-        elif action == ActionType.FOLD:
-            self.players[player_id].state = PlayerState.OUT
-            for i in range(self.players[player_id].last_pot + 1):
-                self.pots[i].remove_player(player_id)
-        else:
-            return False
-
-        return True
+        # a raise reaches the raised level plus the big blind, or goes all in
+        max_raise = bet_amount + player.chips
+        raised_level = self._get_pot(player.last_pot).raised
+        min_raise = max(chips_to_call, min(raised_level + self.big_blind, max_raise))
+        can_raise = min_raise <= max_raise
+        can_call = player.state == PlayerState.TO_CALL
+
+        # in ACTION_TYPES order: RAISE, ALL_IN, CALL, CHECK, FOLD
+        mask = (
+            can_raise,
+            # ALL_IN is a call when the player cannot cover more than the call
+            can_call if player.chips <= chips_to_call else can_raise,
+            can_call,
+            player.state == PlayerState.IN,
+            True,
+        )
+        return LegalActions(
+            player_id,
+            tuple(compress(ACTION_TYPES, mask)),
+            chips_to_call,
+            bet_amount,
+            min_raise if can_raise else None,
+            max_raise if can_raise else None,
+            mask,
+        )
 
-    def _translate_allin(
-        self, action: ActionType, value: int = None
-    ) -> Tuple[ActionType, Optional[int]]:
+    def validate_move(
+        self, player_id: int, action: ActionType, value: Optional[int] = None
+    ) -> bool:
         """
-        Translates an all-in action to the appropriate action,
-        either call or raise.
+        Validate the potentially invalid action for the given player.
+
+        Arguments:
+            player_id (int): the player to take action
+            action (ActionType): The ActionType to take
+            value (int, optional): In the case of raise, how much to raise
+        Returns:
+            bool: True if the move is valid, False o/w
+
         """
-        if action != ActionType.ALL_IN:
-            return action, value
+        return self.check_move(player_id, action, value) is not None
 
-        if self.players[self.current_player].chips <= self.chips_to_call(
-            self.current_player
-        ):
-            return ActionType.CALL, None
+    def _execute_move(self, player_id: int, move: Move):
+        """
+        Executes a resolved move for the given player without validating it.
 
-        return (
-            ActionType.RAISE,
-            self.player_bet_amount(self.current_player)
-            + self.players[self.current_player].chips,
-        )
+        Arguments:
+            player_id (int): the player to take action
+            move (Move): The move, as given by :meth:`check_move`
+        """
+        if move.action_type in (ActionType.CALL, ActionType.RAISE):
+            self._player_post(player_id, move.amount)
+        elif move.action_type == ActionType.FOLD:
+            self.players[player_id].state = PlayerState.OUT
+            for i in range(self.players[player_id].last_pot + 1):
+                self._pot_remove_player(i, player_id)
 
     def _betting_round(self, hand_phase: HandPhase) -> Iterator[TexasHoldEm]:
         """
@@ -796,51 +1186,76 @@ class TexasHoldEm:
         self.hand_history[hand_phase] = BettingRoundHistory(
             new_cards=new_cards, actions=[]
         )
-        self.board.extend(new_cards)
+        self._add_to_board(new_cards)
 
         # player to the left of the button starts
         if hand_phase != HandPhase.PREFLOP:
             self.current_player = next(self.active_iter(loc=self.btn_loc + 1))
 
-        first_pot = self._last_pot_id()
-        player_iter = self.in_pot_iter(self.current_player)
+        self._round_first_pot = self._last_pot_id()
+        self._round_start = self._round_position = self.current_player
 
+        yield from self._betting_turns()
+
+    def _next_to_act(self) -> Optional[int]:
+        """
+        Advances the betting order, as :meth:`in_pot_iter` from _round_start
+        would. The order lives in _round_start and _round_position instead of a
+        generator, so :meth:`snapshot` can capture it.
+
+        Returns:
+            Optional[int]: The player_id of the next player who can take an
+                action, None once every player after _round_start was passed
+        """
+        while self._round_position < self._round_start + self.max_players:
+            player_id = self._round_position % self.max_players
+            self._round_position += 1
+            if self.players[player_id].state in (PlayerState.IN, PlayerState.TO_CALL):
+                return player_id
+        return None
+
+    def _betting_turns(self) -> Iterator[TexasHoldEm]:
+        """
+        The turns left in the betting round in progress, yielding before each
+        action. Ends the round once no more actions can be taken.
+        """
         while not self._is_hand_over():
-            try:
-                self.current_player = next(player_iter)
-            except StopIteration:
+            player_id = self._next_to_act()
+            if player_id is None:
                 break
+            self.current_player = player_id
 
             yield self
 
-            action, val = self._translate_allin(*self._action)
-            passed = self._safe_execute(self.current_player, action, val)
+            self._play_action()
 
-            if not passed:
-                raise ValueError(
-                    f"Invalid move for player {self.current_player}: "
-                    f"{action}, {val}"
-                )
+        # consolidate betting to all pots in this betting round
+        for i in range(self._round_first_pot, len(self.pots)):
+            self._pot_collect_bets(i)
 
-            betting_history = self.hand_history[self.hand_phase]
-            betting_history.actions.append(
-                PlayerAction(
-                    player_id=self.current_player, action_type=action, value=val
-                )
-            )
+    def _play_action(self):
+        """
+        Executes and records the action given to :meth:`take_action` for the
+        current player.
+        """
+        # validated by take_action, or by check_move for take_validated_action
+        move = self._action
+        self._execute_move(self.current_player, move)
+        action, val = move.action_type, move.value
 
-            # On raise, everyone eligible gets to take another action
-            if action == ActionType.RAISE:
-                player_iter = self.in_pot_iter(self.current_player)
+        betting_history = self.hand_history[self.hand_phase]
+        betting_history.actions.append(
+            PlayerAction(player_id=self.current_player, action_type=action, value=val)
+        )
 
-                # Throwaway current player
-                # Edge case: _in_pot_iter already excludes ALL_IN
-                if self.players[self.current_player].state != PlayerState.ALL_IN:
-                    next(player_iter)
+        # On raise, everyone eligible gets to take another action
+        if action == ActionType.RAISE:
+            self._round_start = self._round_position = self.current_player
 
-        # consolidate betting to all pots in this betting round
-        for i in range(first_pot, len(self.pots)):
-            self._get_pot(i).collect_bets()
+            # Throwaway current player
+            # Edge case: _next_to_act already skips ALL_IN
+            if self.players[self.current_player].state != PlayerState.ALL_IN:
+                self._next_to_act()
 
     def get_hand(self, player_id) -> list[Card]:
         """
@@ -893,25 +1308,53 @@ class TexasHoldEm:
             print(self.hand_phase, [x.chips for x in self.players], self.buyin_history)
             raise ValueError("No hand is running")
 
-        if not self.validate_move(self.current_player, action_type, value=value):
+        move = self.check_move(self.current_player, action_type, value)
+        if move is None:
             raise ValueError(f"Move is invalid!{action_type} - {value}")
+        self.take_validated_action(move)
+
+    def take_validated_action(self, move: Move):
+        """
+        The current player makes a move already validated by :meth:`check_move`,
+        which is executed as is. This is the trusted path: the move is neither
+        resolved nor validated again, so a move that is not the current player's
+        in the current state corrupts the game.
+
+        Arguments:
+            move (Move) - The move :meth:`check_move` returned for the current
+                          player after the last action
+        Raises:
+            (ValueError)            - If no hand is running
+
+        """
+        if not self.is_hand_running():
+            raise ValueError("No hand is running")
 
-        self._action = (action_type, value)
+        self._action = move
 
         try:
             next(self._hand_gen)
         except StopIteration:
             pass
 
-    def _hand_iter(self) -> Iterator[TexasHoldEm]:
+    def _hand_iter(self, resume: bool = False) -> Iterator[TexasHoldEm]:
         """
+        Arguments:
+            resume (bool)           - Continue the betting round in progress,
+                                      waiting on the current player's action as
+                                      after :meth:`restore`, defaults to False
         Returns:
             (Iterator[TexasHoldEm])	- A generator over every intermediate game state.
                                       i.e. right before every action.
         Raises:
             (ValueError)            - If phase != PREFLOP
         """
-        if self.hand_phase != HandPhase.PREFLOP:
+        if resume:
+            yield self
+            self._play_action()
+            yield from self._betting_turns()
+            self.hand_phase = self.hand_phase.next_phase()
+        elif self.hand_phase != HandPhase.PREFLOP:
             raise ValueError("Cannot iterate over hand: not time for PREFLOP")
 
         while self.is_hand_running():
@@ -953,6 +1396,183 @@ class TexasHoldEm:
         """
         return self.game_state == GameState.RUNNING
 
+    def snapshot(self) -> GameSnapshot:
+        """
+        Captures the game between actions, i.e. waiting on the current player or
+        between hands, for search and rollouts to branch from.
+
+        Returns:
+            GameSnapshot: The full state of the game as flat tuples, for
+                :meth:`restore`. It does not refer to any generator or to
+                anything the game changes later.
+        """
+        history = None
+        if self.hand_history is not None:
+            rounds = tuple(
+                None
+                if betting_round is None
+                else (tuple(betting_round.new_cards), tuple(betting_round.actions))
+                for betting_round in (
+                    self.hand_history.preflop,
+                    self.hand_history.flop,
+                    self.hand_history.turn,
+                    self.hand_history.river,
+                )
+            )
+            history = (self.hand_history.prehand, *rounds, self.hand_history.settle)
+
+        return GameSnapshot(
+            hand_phase=self.hand_phase,
+            game_state=self.game_state,
+            num_hands=self.num_hands,
+            game_restarts=self.game_restarts,
+            btn_loc=self.btn_loc,
+            sb_loc=self.sb_loc,
+            bb_loc=self.bb_loc,
+            current_player=self.current_player,
+            starting_pot=self.starting_pot,
+            players=tuple(
+                (player.chips, player.state, player.last_pot) for player in self.players
+            ),
+            buyin_history=tuple(self.buyin_history.values()),
+            total_buyin_history=tuple(self.total_buyin_history.values()),
+            pots=tuple(
+                (
+                    pot.amount,
+                    pot.raised,
+                    tuple(pot.player_amounts.items()),
+                    tuple(pot.player_amounts_without_remove.items()),
+                )
+                for pot in self.pots
+            ),
+            bet_totals=tuple(self._bet_totals),
+            call_totals=tuple(self._call_totals),
+            stake_totals=tuple(self._stake_totals),
+            hands=tuple(
+                (player_id, tuple(hand)) for player_id, hand in self.hands.items()
+            ),
+            board=tuple(self.board),
+            community_cards=tuple(self.community_cards),
+            deck=None if self._deck is None else self._deck.snapshot(),
+            hand_evaluators=tuple(
+                (player_id, hand_evaluator.snapshot())
+                for player_id, hand_evaluator in self.hand_evaluators.items()
+            ),
+            hand_scores=None
+            if self._player_hand_scores is None
+            else tuple(self._player_hand_scores.items()),
+            history=history,
+            action=self._action,
+            betting_round=(
+                self._round_first_pot,
+                self._round_start,
+                self._round_position,
+            ),
+        )
+
+    def restore(self, snapshot: GameSnapshot):
+        """
+        Puts the game back in the state of the given snapshot. The snapshot can
+        be restored any number of times, and into a :meth:`clone` of the game.
+
+        Arguments:
+            snapshot (GameSnapshot): As given by :meth:`snapshot`
+        Raises:
+            ValueError: If the snapshot is of a table of another size
+        """
+        if len(snapshot.players) != self.max_players:
+            raise ValueError(
+                f"Expected a snapshot of {self.max_players} players, "
+                f"got {len(snapshot.players)}"
+            )
+
+        self.hand_phase = snapshot.hand_phase
+        self.game_state = snapshot.game_state
+        self.num_hands = snapshot.num_hands
+        self.game_restarts = snapshot.game_restarts
+        self.btn_loc = snapshot.btn_loc
+        self.sb_loc = snapshot.sb_loc
+        self.bb_loc = snapshot.bb_loc
+        self.current_player = snapshot.current_player
+        self.starting_pot = snapshot.starting_pot
+
+        self.players = []
+        for player_id, (chips, state, last_pot) in enumerate(snapshot.players):
+            player = Player(player_id, chips)
+            player.state = state
+            player.last_pot = last_pot
+            self.players.append(player)
+        self.buyin_history = dict(enumerate(snapshot.buyin_history))
+        self.total_buyin_history = dict(enumerate(snapshot.total_buyin_history))
+
+        self.pots = []
+        for amount, raised, player_amounts, without_remove in snapshot.pots:
+            pot = Pot()
+            pot.amount = amount
+            pot.raised = raised
+            pot.player_amounts = dict(player_amounts)
+            pot.player_amounts_without_remove = dict(without_remove)
+            self.pots.append(pot)
+        self._bet_totals = list(snapshot.bet_totals)
+        self._call_totals = list(snapshot.call_totals)
+        self._stake_totals = list(snapshot.stake_totals)
+
+        self.hands = {player_id: list(hand) for player_id, hand in snapshot.hands}
+        self.board = list(snapshot.board)
+        self.community_cards = list(snapshot.community_cards)
+        self._deck = None
+        if snapshot.deck is not None:
+            self._deck = Deck.from_snapshot(snapshot.deck)
+        self.hand_evaluators = {
+            player_id: IncrementalEvaluator.from_snapshot(hand_evaluator)
+            for player_id, hand_evaluator in snapshot.hand_evaluators
+        }
+        self._player_hand_scores = (
+            None if snapshot.hand_scores is None else dict(snapshot.hand_scores)
+        )
+
+        self.hand_history = None
+        if snapshot.history is not None:
+            prehand, *rounds, settle = snapshot.history
+            preflop, flop, turn, river = (
+                None
+                if betting_round is None
+                else BettingRoundHistory(list(betting_round[0]), list(betting_round[1]))
+                for betting_round in rounds
+            )
+            self.hand_history = History(
+                prehand=prehand,
+                preflop=preflop,
+                settle=settle,
+                flop=flop,
+                turn=turn,
+                river=river,
+            )
+
+        self._action = snapshot.action
+        (
+            self._round_first_pot,
+            self._round_start,
+            self._round_position,
+        ) = snapshot.betting_round
+
+        # a running hand waits on the current player inside its betting round
+        self._hand_gen = None
+        if self.is_hand_running():
+            self._hand_gen = self._hand_iter(resume=True)
+            next(self._hand_gen)
+
+    def clone(self) -> TexasHoldEm:
+        """
+        Returns:
+            TexasHoldEm: An independent copy of the game with the same settings,
+                to play ahead on without changing this one
+        """
+        game = copy.copy(self)
+        game._handstate_handler = game._new_handstate_handler()
+        game.restore(self.snapshot())
+        return game
+
     def export_history(
         self, path: Union[str, os.PathLike] = "./texas.pgn"
     ) -> os.PathLike:
@@ -1029,6 +1649,7 @@ class TexasHoldEm:
         # give players old cards
         for i in game.player_iter():
             game.hands[i] = history.prehand.player_cards[i]
+            game.hand_evaluators[i] = IncrementalEvaluator(game.hands[i])
 
         # swap decks
         game._deck = deck
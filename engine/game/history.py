@@ -15,6 +15,7 @@ import os
 
 from engine.game.action_type import ActionType
 from engine.card.card import Card
+from engine.card.card_set import CardSet
 from engine.game.hand_phase import HandPhase
 
 
@@ -500,7 +501,7 @@ class History:
         Raises:
             HistoryImportError: If the cards in the history are not unique
         """
-        cards = sum(self.prehand.player_cards.values(), [])
+        card_groups = list(self.prehand.player_cards.values())
         for hand_phase in (
             HandPhase.PREFLOP,
             HandPhase.FLOP,
@@ -509,10 +510,16 @@ class History:
         ):
             history_item = self[hand_phase]
             if history_item:
-                cards += history_item.new_cards
+                card_groups.append(history_item.new_cards)
 
-        if len(cards) != len(set(cards)):
-            raise HistoryImportError("Expected cards given in history to be unique.")
+        dealt = CardSet()
+        for cards in card_groups:
+            new_cards = CardSet(cards)
+            if len(new_cards) != len(cards) or not dealt.isdisjoint(new_cards):
+                raise HistoryImportError(
+                    "Expected cards given in history to be unique."
+                )
+            dealt |= new_cards
 
     def _check_correct_board_len(self):
         """
@@ -599,9 +599,8 @@ class Window:
         return pot_commits, stage_pot_commits
 
     def validate_move(self):
-        return self.env.game.validate_move(
-            self.env.game.current_player, self.action, self.val
-        )
+        game = self.env.game
+        return game.legal_actions(game.current_player).is_legal(self.action, self.val)
 
     def get_winner_id(self):
         """Gets Winner of the game"""
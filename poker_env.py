@@ -9,12 +9,12 @@ from gym import spaces, Env
 from gui import Window
 
 from engine import TexasHoldEm
+from engine.card.card import CARD_RANKS, CARD_SUIT_INDICES
 from engine.game.game import Player
 from engine.gui.text_gui import TextGUI
 from engine.game.hand_phase import HandPhase
 from engine.game.action_type import ActionType
 from engine.game.history import PrehandHistory
-from engine.evaluator.evaluator import evaluate
 from engine.game.player_state import PlayerState
 from agent import RandomAgent, CrammerAgent, RLAgent
 from utils.flatten import flatten_spaces, flatten_array
@@ -69,13 +69,11 @@ class PokerEnv(Env):
             ActionType.FOLD: 3,
             ActionType.ALL_IN: 4,
         }
-        self.suit_to_int = {
-            "s": 1,  # spades
-            "h": 2,  # hearts
-            "d": 3,  # diamonds
-            "c": 4,  # clubs
-        }
-        self.card_num_to_int = {"T": 9, "J": 10, "Q": 11, "K": 12, "A": 13}
+        # (rank 1-13, suit 1-4 for spades, hearts, diamonds, clubs) by card index
+        self.card_observations = tuple(
+            (rank + 1, suit_index + 1)
+            for rank, suit_index in zip(CARD_RANKS, CARD_SUIT_INDICES)
+        )
 
         self.game = TexasHoldEm(
             buyin=self.buy_in,
@@ -192,13 +190,7 @@ class PokerEnv(Env):
         self.opponents[player_id] = agent
 
     def card_to_observation(self, card):
-        card = list(str(card))
-        if self.card_num_to_int.get(card[0], 0):
-            card[0] = self.card_num_to_int[card[0]]
-        else:
-            card[0] = int(card[0]) - 1
-        card[1] = self.suit_to_int[card[1]]
-        return tuple(card)
+        return self.card_observations[card.index]
 
     def clip(self, value, _min=-1, _max=1, round_to=3):
         return round(max(min(value, _max), _min), round_to)
@@ -219,9 +211,7 @@ class PokerEnv(Env):
         if self.game.hand_phase != HandPhase.PREHAND and self.game.players[
             player_id
         ].state not in (PlayerState.OUT, PlayerState.SKIP):
-            hand_score = self.max_hand_score - evaluate(
-                self.game.hands[player_id], self.game.board
-            )
+            hand_score = self.max_hand_score - self.game.get_hand_rank(player_id)
         # print(
         #     "hs:",
         #     hand_score,
@@ -473,16 +463,14 @@ class PokerEnv(Env):
         else:
             val = None
 
-        # check valid action
-        if not self.game.validate_move(current_player.player_id, action, val):
-            action = (
-                ActionType.CHECK
-                if self.game.validate_move(
-                    current_player.player_id, ActionType.CHECK, None
-                )
-                else ActionType.FOLD
-            )
-            val = None
+        # check valid action, falling back to a check or fold
+        move = self.game.check_move(current_player.player_id, action, val)
+        if move is None:
+            action, val = ActionType.CHECK, None
+            move = self.game.check_move(current_player.player_id, action)
+        if move is None:
+            action = ActionType.FOLD
+            move = self.game.check_move(current_player.player_id, action)
 
         if self.debug:
             print(
@@ -495,7 +483,8 @@ class PokerEnv(Env):
         # agent take action
         self.current_agent_action = (action, val, self.game.hand_phase)
         self.action_dict[self.game.current_player][self.action_to_num[action]] += 1
-        self.game.take_action(action, val)
+        # validated once above, executed as is
+        self.game.take_validated_action(move)
 
         done = not self.game.is_hand_running()
 
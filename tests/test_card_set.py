@@ -0,0 +1,131 @@
+"""
+Tests for CardSet: set algebra and iteration must agree with Python sets of
+cards, and evaluate, Deck and History must treat a CardSet like a list.
+"""
+
+import pickle
+import random
+
+import pytest
+
+from engine import ActionType, TexasHoldEm
+from engine.card.card import Card
+from engine.card.card_set import CardSet
+from engine.card.deck import Deck
+from engine.evaluator.evaluator import evaluate
+from engine.game.history import HistoryImportError
+
+FULL_DECK = Deck._get_full_deck()  # pylint: disable=protected-access
+NUM_SAMPLES = 2_000
+
+
+def _random_cards(rng):
+    return rng.sample(FULL_DECK, rng.randint(0, len(FULL_DECK)))
+
+
+def _ordered(cards):
+    return [card for card in FULL_DECK if card in set(cards)]
+
+
+def test_set_algebra_matches_python_sets():
+    rng = random.Random(0)
+    for _ in range(NUM_SAMPLES):
+        left, right = _random_cards(rng), _random_cards(rng)
+        left_set, right_set = CardSet(left), CardSet(right)
+
+        assert list(left_set | right_set) == _ordered(set(left) | set(right))
+        assert list(left_set & right_set) == _ordered(set(left) & set(right))
+        assert list(left_set - right_set) == _ordered(set(left) - set(right))
+        assert list(~left_set) == _ordered(set(FULL_DECK) - set(left))
+        assert left_set.isdisjoint(right_set) == set(left).isdisjoint(right)
+        assert (left_set <= right_set) == set(left).issubset(right)
+        # lists work wherever another CardSet does
+        assert left_set.union(right) == left_set | right_set
+        assert left_set.isdisjoint(right) == left_set.isdisjoint(right_set)
+
+        assert len(left_set) == len(left)
+        assert bool(left_set) == bool(left)
+        assert all(card in left_set for card in left)
+        assert not any(card in left_set for card in set(FULL_DECK) - set(left))
+
+
+def test_iterates_in_full_deck_order():
+    assert list(CardSet.full()) == FULL_DECK
+    assert CardSet.full().to_list() == FULL_DECK
+    assert not CardSet()
+
+    rng = random.Random(1)
+    for _ in range(NUM_SAMPLES):
+        cards = _random_cards(rng)
+        assert list(CardSet(cards)) == _ordered(cards)
+
+
+def test_duplicates_equality_and_hash():
+    cards = [Card("As"), Card("Kd"), Card("As")]
+    card_set = CardSet(cards)
+    assert len(card_set) == 2
+    assert card_set == CardSet(reversed(cards))
+    assert hash(card_set) == hash(CardSet(card_set))
+    assert card_set != CardSet([Card("As")])
+    assert pickle.loads(pickle.dumps(card_set)) == card_set
+    assert str(card_set) == " ".join(str(card) for card in _ordered(cards))
+
+
+def test_from_mask_and_immutability():
+    assert CardSet.from_mask(0b101) == CardSet([FULL_DECK[0], FULL_DECK[2]])
+    with pytest.raises(ValueError):
+        CardSet.from_mask(1 << len(FULL_DECK))
+    with pytest.raises(AttributeError):
+        CardSet().mask = 1
+
+
+@pytest.mark.parametrize("num_board", [0, 3, 4, 5])
+def test_evaluate_card_set_matches_list(num_board):
+    rng = random.Random(num_board)
+    for _ in range(NUM_SAMPLES):
+        cards = rng.sample(FULL_DECK, 2 + num_board)
+        hand, board = cards[:2], cards[2:]
+        expected = evaluate(hand, board)
+        assert evaluate(CardSet(hand), CardSet(board)) == expected
+        assert evaluate(hand, CardSet(board)) == expected
+        assert evaluate(CardSet(hand), board) == expected
+
+
+def test_evaluate_keeps_type_errors():
+    hand = (Card("As"), Card("Kd"))
+    board = [Card("Ah"), Card("7c"), Card("2d")]
+    with pytest.raises(TypeError):
+        evaluate(hand, board)
+
+
+def test_deck_dead_cards_and_remaining():
+    rng = random.Random(2)
+    for _ in range(100):
+        dead = CardSet(rng.sample(FULL_DECK, rng.randint(1, 10)))
+        deck = Deck(dead_cards=dead)
+        assert deck.remaining == ~dead
+        assert deck.remaining.isdisjoint(dead)
+
+        drawn = deck.draw(3)
+        assert deck.remaining == ~dead - drawn
+        assert Deck(dead_cards=list(dead)).remaining == ~dead
+
+
+def test_history_rejects_repeated_cards():
+    game = TexasHoldEm(
+        buyin=500, big_blind=10, small_blind=5, agent_id=0, max_players=3
+    )
+    game.start_hand()
+    while game.is_hand_running():
+        if game.chips_to_call(game.current_player):
+            game.take_action(ActionType.CALL)
+        else:
+            game.take_action(ActionType.CHECK)
+
+    history = game.hand_history
+    # pylint: disable=protected-access
+    history._check_unique_cards()
+    player_cards = history.prehand.player_cards
+    player_cards[1] = [player_cards[0][0], player_cards[1][1]]
+    with pytest.raises(HistoryImportError):
+        history._check_unique_cards()
@@ -0,0 +1,84 @@
+"""
+Tests for the block-pregenerated decks of DeckSource and deal_hands.
+"""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from engine.card.card import CARDS
+from engine.card.deck import (
+    DECK_SOURCE,
+    NUM_COMMUNITY_CARDS,
+    Deck,
+    DeckSource,
+    deal_hands,
+)
+
+NUM_CARDS = len(CARDS)
+
+
+def test_orders_are_permutations_across_blocks():
+    source = DeckSource(block_size=16, seed=0)
+    orders = [source.next_order() for _ in range(40)]
+    orders += source.deal(100).tolist()
+    for order in orders:
+        assert sorted(order) == list(range(NUM_CARDS))
+    # the blocks are not repeated
+    assert len({tuple(order) for order in orders}) == len(orders)
+
+
+@pytest.mark.parametrize("num_players", [2, 6, 9, 23])
+def test_deal_hands_deals_each_card_once(num_players):
+    num_hands = 1000
+    hands, boards = deal_hands(num_hands, num_players, DeckSource(256, seed=1))
+    assert hands.shape == (num_hands, num_players, 2)
+    assert boards.shape == (num_hands, NUM_COMMUNITY_CARDS)
+
+    cards = np.concatenate((hands.reshape(num_hands, -1), boards), axis=1)
+    assert np.isin(cards, CARDS).all()
+    for hand_cards in cards:
+        assert len(set(hand_cards.tolist())) == 2 * num_players + NUM_COMMUNITY_CARDS
+
+
+def test_deal_hands_rejects_too_many_players():
+    with pytest.raises(ValueError):
+        deal_hands(1, 24)
+
+
+def test_seed_reproduces_decks():
+    first, second = DeckSource(8, seed=3), DeckSource(8, seed=3)
+    assert [first.next_order() for _ in range(20)] == [
+        second.next_order() for _ in range(20)
+    ]
+    assert (first.deal(50) == second.deal(50)).all()
+
+    random.seed(4)
+    DECK_SOURCE.seed()
+    decks = [Deck().cards for _ in range(3)]
+    random.seed(4)
+    DECK_SOURCE.seed()
+    assert [Deck().cards for _ in range(3)] == decks
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_drops_pending_block():
+    # the parent has a block with decks left to deal
+    DECK_SOURCE.next_order()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        order = DECK_SOURCE.next_order()
+        os.write(write_end, bytes(order))
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_end)
+    with os.fdopen(read_end, "rb") as pipe:
+        child_order = list(pipe.read())
+    os.waitpid(pid, 0)
+
+    assert sorted(child_order) == list(range(NUM_CARDS))
+    assert child_order != DECK_SOURCE.next_order()
@@ -0,0 +1,129 @@
+"""
+Tests for the hand evaluator: 6 and 7 card hands must rank as the best of their
+5 card subsets through :func:`engine.evaluator.evaluator._five`.
+"""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from engine.card.card import Card
+from engine.card.deck import Deck
+from engine.evaluator import evaluator, table_file
+from engine.evaluator.batch import evaluate_batch
+from engine.evaluator.evaluator import _five, _seven, evaluate
+from engine.evaluator.lookup_table import LookupTable, SortedLookup, load_lookup_table
+
+CARDS = Deck._get_full_deck()  # pylint: disable=protected-access
+NUM_HANDS = 20_000
+
+
+def _best_five(cards):
+    return min(_five(list(hand)) for hand in itertools.combinations(cards, 5))
+
+
+def _cards(strings):
+    return [Card(string) for string in strings.split()]
+
+
+def _flush_hand(rng, num_cards):
+    suit = rng.choice(list(Card.CHAR_SUIT_TO_INT_SUIT.values()))
+    suited = [card for card in CARDS if card.suit == suit]
+    cards = rng.sample(suited, rng.randint(5, num_cards))
+    others = [card for card in CARDS if card not in cards]
+    cards += rng.sample(others, num_cards - len(cards))
+    rng.shuffle(cards)
+    return cards
+
+
+@pytest.fixture(params=evaluator.BACKENDS)
+def backend(request):
+    try:
+        evaluator.set_backend(request.param)
+    except ValueError:
+        pytest.skip(f"{request.param} backend not available")
+    yield request.param
+    evaluator.set_backend(None)
+
+
+@pytest.mark.parametrize("num_cards", [6, 7])
+def test_random_hands_match_five_card_path(backend, num_cards):
+    # pylint: disable=unused-argument
+    rng = random.Random(num_cards)
+    for _ in range(NUM_HANDS):
+        cards = rng.sample(CARDS, num_cards)
+        expected = _best_five(cards)
+        assert _seven(cards) == expected
+        assert evaluate(cards[:2], cards[2:]) == expected
+
+
+@pytest.mark.parametrize("num_cards", [6, 7])
+def test_random_flushes_match_five_card_path(backend, num_cards):
+    # pylint: disable=unused-argument
+    rng = random.Random(100 + num_cards)
+    for _ in range(NUM_HANDS // 4):
+        cards = _flush_hand(rng, num_cards)
+        expected = _best_five(cards)
+        assert expected <= LookupTable.MAX_FLUSH
+        assert _seven(cards) == expected
+        assert evaluate(cards[:2], cards[2:]) == expected
+
+
+@pytest.mark.parametrize(
+    "hand, board, expected",
+    [
+        # royal flush, with a pair and a lower flush card around it
+        ("Ah Kh", "Qh Jh Th 9h Ad", 1),
+        # wheel straight flush beside an ace high flush
+        ("Ah 2h", "3h 4h 5h 9h Kd", 10),
+        # six to the straight flush: the higher one counts
+        ("8s 9s", "Ts Js Qs 4s 4d", 3),
+        # straight flush over quads on the board
+        ("5c 6c", "7c 8c 9c 9d 9h", 6),
+    ],
+)
+def test_straight_flushes(backend, hand, board, expected):
+    # pylint: disable=unused-argument
+    cards, board = _cards(hand), _cards(board)
+    assert _best_five(cards + board) == expected
+    assert evaluate(cards, board) == expected
+    assert evaluate(cards, board[:4]) == _best_five(cards + board[:4])
+
+
+@pytest.mark.parametrize("num_cards", [2, 5, 6, 7])
+def test_batch_matches_evaluate(num_cards):
+    rng = random.Random(200 + num_cards)
+    hands = [rng.sample(CARDS, num_cards) for _ in range(NUM_HANDS)]
+    if num_cards >= 5:
+        hands += [_flush_hand(rng, num_cards) for _ in range(NUM_HANDS // 4)]
+    expected = [evaluate(cards[:2], cards[2:]) for cards in hands]
+
+    cards = np.array(hands, dtype=np.int64)
+    # a small chunk size so that the batch spans several chunks
+    ranks = evaluate_batch(cards[:, :2], cards[:, 2:], chunk_size=4096)
+    assert ranks.tolist() == expected
+
+
+def test_missing_table_file_is_built_in_memory(tmp_path):
+    path = tmp_path / "lookup_table.bin"
+    table = load_lookup_table(path)
+    assert table.tables is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_mapped_table_matches_built(tmp_path):
+    built = LookupTable()
+    path = table_file.save_tables(built, tmp_path / "lookup_table.bin")
+    mapped = load_lookup_table(path)
+
+    # the mapped table answers from the file, without per-process copies
+    assert isinstance(mapped.unsuited_lookup, SortedLookup)
+    assert isinstance(mapped.flush_rankbits_lookup, memoryview)
+    assert mapped.flush_lookup == built.flush_lookup
+    assert mapped.unsuited_lookup == built.unsuited_lookup
+    assert list(mapped.flush_rankbits_lookup) == built.flush_rankbits_lookup
+    assert list(mapped.rank_class_lookup) == built.rank_class_lookup
+    with pytest.raises(KeyError):
+        mapped.unsuited_lookup[1]  # pylint: disable=pointless-statement
@@ -0,0 +1,254 @@
+"""
+Tests for the TexasHoldEm game engine.
+"""
+
+import random
+
+import pytest
+
+from engine import ActionType, TexasHoldEm
+from engine.card.deck import DECK_SOURCE
+from engine.game.game import ACTION_TYPES, PlayerState
+
+
+def _game(stacks, btn_loc, **kwargs):
+    game = TexasHoldEm(
+        buyin=500,
+        big_blind=10,
+        small_blind=5,
+        agent_id=0,
+        max_players=len(stacks),
+        **kwargs,
+    )
+    for player, chips in zip(game.players, stacks):
+        player.chips = chips
+    # the button moves to the next active player at PREHAND
+    game.btn_loc = btn_loc
+    return game
+
+
+def test_settle_side_pot_left_by_folded_raiser():
+    stacks = (60, 150, 150, 400)
+    game = _game(stacks, btn_loc=3)
+    game.start_hand()
+
+    # seat 3 raises into a side pot above the short all-ins, then folds
+    for player_id, action, value in (
+        (3, ActionType.CALL, None),
+        (0, ActionType.ALL_IN, None),
+        (1, ActionType.ALL_IN, None),
+        (2, ActionType.RAISE, 140),
+        (3, ActionType.RAISE, 270),
+        (2, ActionType.RAISE, 100),
+        (3, ActionType.FOLD, None),
+    ):
+        assert game.current_player == player_id
+        game.take_action(action, value)
+
+    assert not game.is_hand_running()
+    assert sum(player.chips for player in game.players) + game.starting_pot == sum(
+        stacks
+    )
+    assert game.players[3].chips == 400 - 270
+    for winners in game.hand_history.settle.pot_winners.values():
+        assert 3 not in winners[2]
+
+
+def test_lazy_hand_scores_keep_folded_players():
+    eager = _game((500,) * 6, btn_loc=0)
+    lazy = _game((500,) * 6, btn_loc=0, lazy_hand_scores=True)
+    for game in (eager, lazy):
+        game.start_hand()
+        folded = game.current_player
+        game.take_action(ActionType.FOLD)
+        assert game.players[folded].state == PlayerState.OUT
+
+    assert lazy.player_hand_scores.keys() == eager.player_hand_scores.keys()
+    assert sorted(lazy.player_hand_scores) == list(range(6))
+
+
+def _random_action(game, rng):
+    legal = game.legal_actions(game.current_player)
+    action = rng.choice(legal.actions)
+    if action == ActionType.RAISE:
+        return action, rng.randint(legal.min_raise, legal.max_raise)
+    return action, None
+
+
+def test_validated_moves_play_like_take_action():
+    rng = random.Random(0)
+    strict = _game((500,) * 6, btn_loc=0, add_chips_when_lose=True)
+    trusted = _game((500,) * 6, btn_loc=0, add_chips_when_lose=True)
+    for hand in range(200):
+        for game in (strict, trusted):
+            DECK_SOURCE.seed(hand)
+            game.start_hand()
+
+        while strict.is_hand_running():
+            player_id = strict.current_player
+            action, value = _random_action(strict, rng)
+            move = trusted.check_move(player_id, action, value)
+            assert move is not None
+            assert move.action_type != ActionType.ALL_IN
+            strict.take_action(action, value)
+            trusted.take_validated_action(move)
+
+        assert not trusted.is_hand_running()
+        assert strict.hand_history.settle is not None
+        assert str(trusted.hand_history) == str(strict.hand_history)
+        assert [player.chips for player in trusted.players] == [
+            player.chips for player in strict.players
+        ]
+
+
+def test_check_move_rejects_invalid_moves():
+    game = _game((500,) * 3, btn_loc=0)
+    game.start_hand()
+    player_id = game.current_player
+    # facing the big blind, checking and raising below the minimum are invalid
+    assert game.check_move(player_id, ActionType.CHECK) is None
+    assert game.check_move(player_id, ActionType.RAISE, 15) is None
+    assert game.check_move((player_id + 1) % 3, ActionType.FOLD) is None
+    assert game.check_move(player_id, ActionType.CALL).amount == 10
+    assert game.check_move(player_id, ActionType.ALL_IN) == (
+        ActionType.RAISE,
+        500,
+        500,
+    )
+
+
+def _check_totals(game):
+    # pylint: disable=protected-access
+    for player_id in range(game.max_players):
+        game._check_bet_totals(player_id)
+
+
+@pytest.mark.parametrize("num_players", [2, 3, 6, 9])
+def test_running_totals_match_pots(num_players):
+    rng = random.Random(num_players)
+    stacks = [rng.randint(20, 1000) for _ in range(num_players)]
+    game = _game(stacks, btn_loc=0, add_chips_when_lose=True)
+    DECK_SOURCE.seed(num_players)
+
+    max_pots = 0
+    all_ins = 0
+    for _ in range(300):
+        game.start_hand()
+        _check_totals(game)
+        while game.is_hand_running():
+            action, value = _random_action(game, rng)
+            all_ins += action == ActionType.ALL_IN
+            game.take_action(action, value)
+            max_pots = max(max_pots, len(game.pots))
+            _check_totals(game)
+
+    assert all_ins
+    assert max_pots > 1
+
+
+@pytest.mark.parametrize("num_players", [2, 3, 6, 9])
+def test_legal_actions_agree_with_validate_move(num_players):
+    rng = random.Random(100 + num_players)
+    stacks = [rng.randint(20, 600) for _ in range(num_players)]
+    game = _game(stacks, btn_loc=0, add_chips_when_lose=True)
+    DECK_SOURCE.seed(100 + num_players)
+
+    for _ in range(25):
+        game.start_hand()
+        while game.is_hand_running():
+            # players waiting for their turn have no legal actions
+            for player_id in range(num_players):
+                legal = game.legal_actions(player_id)
+                assert legal.player_id == player_id
+                for action in ActionType:
+                    assert legal.is_legal(action) == game.validate_move(
+                        player_id, action
+                    )
+                    assert (action in legal.actions) == legal.mask[
+                        ACTION_TYPES.index(action)
+                    ]
+
+            # every raise value of the current player, up to just past all in
+            player_id = game.current_player
+            legal = game.legal_actions(player_id)
+            max_value = legal.bet_amount + game.players[player_id].chips + 1
+            for value in range(max_value + 1):
+                assert legal.is_legal(ActionType.RAISE, value) == game.validate_move(
+                    player_id, ActionType.RAISE, value
+                )
+
+            game.take_action(*_random_action(game, rng))
+
+
+def _state(game):
+    return (
+        str(game.hand_history),
+        [(pot.amount, pot.raised, dict(pot.player_amounts)) for pot in game.pots],
+        [(player.chips, player.state, player.last_pot) for player in game.players],
+        game.current_player,
+        game.hand_phase,
+        game.btn_loc,
+        game.is_hand_running(),
+    )
+
+
+def _play_branch(game, seed):
+    # the rest of the hand and the next one, with seeded actions and deck
+    rng = random.Random(seed)
+    states = []
+    for hand in range(2):
+        if hand:
+            DECK_SOURCE.seed(seed)
+            game.start_hand()
+        while game.is_hand_running():
+            game.take_action(*_random_action(game, rng))
+            states.append(_state(game))
+    return states
+
+
+def _check_branches(game, stacks, seed):
+    snapshot = game.snapshot()
+    source_state = _state(game)
+
+    cloned = game.clone()
+    assert _state(cloned) == source_state
+    expected = _play_branch(cloned, seed)
+    assert _state(game) == source_state
+
+    restored = _game(stacks, btn_loc=0, add_chips_when_lose=True)
+    restored.restore(snapshot)
+    assert _state(restored) == source_state
+    assert _play_branch(restored, seed) == expected
+
+    # a snapshot restores again after its branch was played
+    cloned.restore(snapshot)
+    assert _state(cloned) == source_state
+    assert _play_branch(cloned, seed) == expected
+    assert _state(game) == source_state
+
+    # and into the game it was taken from
+    assert _play_branch(game, seed) == expected
+    game.restore(snapshot)
+    assert _state(game) == source_state
+
+
+@pytest.mark.parametrize("num_players", [2, 6, 9])
+def test_snapshot_branches_replay_identically(num_players):
+    rng = random.Random(200 + num_players)
+    stacks = [rng.randint(20, 1000) for _ in range(num_players)]
+    game = _game(stacks, btn_loc=0, add_chips_when_lose=True)
+    DECK_SOURCE.seed(200 + num_players)
+
+    branches = 0
+    for _ in range(60):
+        game.start_hand()
+        while game.is_hand_running():
+            # at random decision points, and sometimes between hands
+            if rng.random() < 0.2:
+                _check_branches(game, stacks, rng.getrandbits(32))
+                branches += 1
+            game.take_action(*_random_action(game, rng))
+        if rng.random() < 0.2:
+            _check_branches(game, stacks, rng.getrandbits(32))
+
+    assert branches
@@ -0,0 +1,84 @@
+"""
+Tests for the suit isomorphism indexer: every street's index must be a
+bijection onto [0, num_hand_indices) that ignores how the suits are labelled.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from engine.card.card import Card
+from engine.card.combos import CARDS
+from engine.card.isomorphism import (
+    hand_index,
+    hand_indexer,
+    hand_unindex,
+    num_hand_indices,
+)
+
+NUM_SAMPLES = 20_000
+
+
+def _relabel(cards, suits):
+    mapping = dict(zip("shdc", suits))
+    return [Card(str(card)[0] + mapping[str(card)[1]]) for card in cards]
+
+
+def test_preflop_has_169_classes():
+    assert num_hand_indices(0) == 169
+    indices = {hand_index(hand) for hand in itertools.combinations(CARDS, 2)}
+    assert indices == set(range(169))
+
+
+@pytest.mark.parametrize(
+    "num_board, size",
+    [(0, 169), (3, 1_286_792), (4, 55_190_538), (5, 2_428_287_420)],
+)
+def test_street_sizes(num_board, size):
+    assert num_hand_indices(num_board) == size
+
+
+def test_flop_round_trips():
+    rng = random.Random(3)
+    indexer = hand_indexer(3)
+    indices = [0, 1, indexer.size - 2, indexer.size - 1]
+    indices += rng.sample(range(indexer.size), NUM_SAMPLES)
+    for index in indices:
+        assert indexer.index(indexer.unindex(index)) == index
+
+
+@pytest.mark.slow
+def test_flop_round_trips_exhaustively():
+    indexer = hand_indexer(3)
+    for index in range(indexer.size):
+        assert indexer.index(indexer.unindex(index)) == index
+
+
+@pytest.mark.parametrize("num_board", [4, 5])
+def test_turn_and_river_round_trip(num_board):
+    rng = random.Random(num_board)
+    indexer = hand_indexer(num_board)
+    # both ends of the range, then random indices
+    indices = [0, 1, indexer.size - 2, indexer.size - 1]
+    indices += rng.sample(range(indexer.size), NUM_SAMPLES)
+    for index in indices:
+        hand, board = hand_unindex(index, num_board)
+        assert len(hand) == 2 and len(board) == num_board
+        assert len(set(hand + board)) == 2 + num_board
+        assert hand_index(hand, board) == index
+
+
+@pytest.mark.parametrize("num_board", [0, 3, 4, 5])
+def test_index_ignores_suit_labels(num_board):
+    rng = random.Random(100 + num_board)
+    for _ in range(NUM_SAMPLES // 20):
+        cards = rng.sample(CARDS, 2 + num_board)
+        hand, board = cards[:2], cards[2:]
+        index = hand_index(hand, board)
+        assert 0 <= index < num_hand_indices(num_board)
+        for suits in itertools.permutations("shdc"):
+            assert hand_index(_relabel(hand, suits), _relabel(board, suits)) == index
+
+        canonical_hand, canonical_board = hand_unindex(index, num_board)
+        assert hand_index(canonical_hand, canonical_board) == index